@@ -1,16 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict, List, Optional, Tuple
 
 from bacpypes3.pdu import Address
-from bacpypes3.primitivedata import ObjectIdentifier, Null
-from bacpypes3.apdu import ErrorRejectAbortNack, PropertyReference, PropertyIdentifier, ErrorType
-from bacpypes3.constructeddata import AnyAtomic
+from bacpypes3.primitivedata import ObjectIdentifier, Null, Unsigned
+from bacpypes3.apdu import (
+    ErrorRejectAbortNack,
+    PropertyReference,
+    PropertyIdentifier,
+    RejectPDU,
+    RejectReason,
+    WritePropertyMultipleError,
+    WritePropertyMultipleRequest,
+)
+from bacpypes3.basetypes import PropertyValue, WriteAccessSpecification
+from bacpypes3.constructeddata import Array
 from bacpypes3.app import Application
 from bacpypes3.argparse import SimpleArgumentParser
 from bacpypes3.vendor import get_vendor_info
 
-from .base import BacnetClient
+from .base import BacnetClient, write_result
+from .encoding import encode_rpm_response, encode_value
+from .points import PointCache, parse_property_identifier
 
 
 class BacpypesClient(BacnetClient):
@@ -20,16 +32,23 @@ class BacpypesClient(BacnetClient):
     should use this.
     """
 
-    def __init__(self, args=None, argv=None):
+    def __init__(self, args=None, argv=None, app: Application | None = None):
         parser = SimpleArgumentParser()
         # allow callers to pass through bacpypes3 args
         if args is not None:
             self.args = args
         elif argv is not None:
             self.args = parser.parse_args(argv)
+        elif app is not None:
+            self.args = None
         else:
             self.args = parser.parse_args()
-        self.app: Application | None = None
+        # an Application that is already running (e.g. an EasyASO agent's) may be shared
+        self.app: Application | None = app
+        # device address -> False once it rejected WritePropertyMultiple
+        self._wpm_support: Dict[str, bool] = {}
+        # parsed points and per-device vendor info, so hot calls skip the parsing
+        self.points = PointCache()
 
     async def start(self) -> None:
         self.app = Application.from_args(self.args)
@@ -46,18 +65,14 @@ class BacpypesClient(BacnetClient):
         return ObjectIdentifier((obj_type.strip(), int(inst.strip())))
 
     def _parse_property_identifier(self, property_identifier: str) -> Tuple[str, Optional[int]]:
-        if "," in property_identifier:
-            prop_id, prop_index = property_identifier.split(",")
-            return prop_id.strip(), int(prop_index.strip())
-        return property_identifier, None
+        return parse_property_identifier(property_identifier)
 
     async def read(self, address: str, object_identifier: str, property_identifier: str = "present-value") -> Any:
         assert self.app is not None, "BacpypesClient.start() must be called first"
+        point = self.points.handle(address, object_identifier, property_identifier)
         try:
-            pv = await self.app.read_property(self._addr(address), self._obj(object_identifier), property_identifier)
-            if isinstance(pv, AnyAtomic):
-                return pv.get_value()
-            return pv
+            pv = await self.app.read_property(point.address_obj, point.object_id, point.property_id, point.array_index)
+            return encode_value(pv)
         except ErrorRejectAbortNack as e:
             raise RuntimeError(f"BACnet read failed: {e}") from e
 
@@ -71,7 +86,7 @@ class BacpypesClient(BacnetClient):
     ) -> None:
         assert self.app is not None, "BacpypesClient.start() must be called first"
 
-        prop_id, prop_index = self._parse_property_identifier(property_identifier)
+        point = self.points.handle(address, object_identifier, property_identifier)
 
         if value == "null":
             if priority is None:
@@ -80,16 +95,167 @@ class BacpypesClient(BacnetClient):
 
         try:
             await self.app.write_property(
-                self._addr(address),
-                self._obj(object_identifier),
-                prop_id,
+                point.address_obj,
+                point.object_id,
+                point.property_id,
                 value,
-                prop_index,
+                point.array_index,
                 priority if priority is not None else -1,
             )
         except ErrorRejectAbortNack as e:
             raise RuntimeError(f"BACnet write failed: {e}") from e
 
+    async def write_many(self, writes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Group writes per device into WritePropertyMultiple requests.
+
+        Devices are written concurrently; each device's writes reach it in the
+        order given. A device that rejects WPM is remembered and gets one
+        WriteProperty at a time from then on. When a WPM request fails part
+        way, the writes before the failed one are done, and the ones after it
+        (and the rest of that device's writes) are sent one at a time.
+        """
+        assert self.app is not None, "BacpypesClient.start() must be called first"
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(writes)
+        by_address: Dict[str, List[int]] = {}
+        for i, w in enumerate(writes):
+            by_address.setdefault(str(w["address"]), []).append(i)
+
+        async def device(address: str, indexes: List[int]) -> None:
+            pending = indexes
+            if len(indexes) > 1 and self._wpm_support.get(address, True):
+                pending = await self._write_wpm(address, indexes, writes, results)
+            for i in pending:
+                w = writes[i]
+                try:
+                    await self.write(
+                        w["address"],
+                        w["object_identifier"],
+                        w["value"],
+                        w.get("priority"),
+                        w.get("property_identifier", "present-value"),
+                    )
+                except Exception as e:  # noqa: BLE001
+                    results[i] = write_result(w, str(e))
+                else:
+                    results[i] = write_result(w)
+
+        await asyncio.gather(*(device(a, idx) for a, idx in by_address.items()))
+        return results  # type: ignore[return-value]
+
+    def _property_value(self, vendor_info, w: Dict[str, Any]) -> Tuple[ObjectIdentifier, PropertyValue]:
+        obj_id = self._obj(w["object_identifier"])
+        object_class = vendor_info.get_object_class(obj_id[0])
+        if not object_class:
+            raise ValueError(f"Unrecognized object type: {obj_id}")
+        prop_id, prop_index = self._parse_property_identifier(w.get("property_identifier", "present-value"))
+        property_type = object_class.get_property_type(prop_id)
+        if not property_type:
+            raise ValueError(f"Unrecognized property: {prop_id}")
+        if issubclass(property_type, Array) and prop_index is not None:
+            property_type = Unsigned if prop_index == 0 else property_type._subtype
+
+        value, priority = w["value"], w.get("priority")
+        if value == "null":
+            if priority is None:
+                raise ValueError("null can only be used for overrides with a priority")
+            value = Null(())
+        elif not isinstance(value, property_type):
+            value = property_type(value)
+
+        pv = PropertyValue(propertyIdentifier=prop_id, value=value)
+        if prop_index is not None:
+            pv.propertyArrayIndex = prop_index
+        if priority is not None:
+            pv.priority = priority
+        return obj_id, pv
+
+    async def _write_wpm(
+        self,
+        address: str,
+        indexes: List[int],
+        writes: List[Dict[str, Any]],
+        results: List[Optional[Dict[str, Any]]],
+    ) -> List[int]:
+        """Send ``indexes`` as WPM requests; return the indexes still to write."""
+        addr = self._addr(address)
+        device_info = await self.app.device_info_cache.get_device_info(addr)
+        vendor_info = get_vendor_info(device_info.vendor_identifier if device_info else 0)
+        max_apdu = device_info.max_apdu_length_accepted if device_info else 480
+        chunk_size = max(1, min(50, (max_apdu - 16) // 24))
+
+        pending: List[int] = []
+        for offset in range(0, len(indexes), chunk_size):
+            part = indexes[offset : offset + chunk_size]
+            # once a write is left for later, the rest wait too, to keep the order
+            if pending or not self._wpm_support.get(address, True):
+                pending.extend(part)
+                continue
+
+            # consecutive writes to one object share a spec; the order is kept
+            specs: List[Tuple[ObjectIdentifier, List[PropertyValue]]] = []
+            sent: List[int] = []
+            for i in part:
+                try:
+                    obj_id, pv = self._property_value(vendor_info, writes[i])
+                except (ValueError, TypeError) as e:
+                    results[i] = write_result(writes[i], str(e))
+                    continue
+                if specs and specs[-1][0] == obj_id:
+                    specs[-1][1].append(pv)
+                else:
+                    specs.append((obj_id, [pv]))
+                sent.append(i)
+            if not sent:
+                continue
+
+            request = WritePropertyMultipleRequest(
+                listOfWriteAccessSpecs=[
+                    WriteAccessSpecification(objectIdentifier=obj_id, listOfProperties=pvs)
+                    for obj_id, pvs in specs
+                ],
+                destination=addr,
+            )
+            try:
+                await self.app.request(request)
+            except WritePropertyMultipleError as err:
+                pos = self._failed_position(err, [writes[i] for i in sent])
+                if pos is None:
+                    pending.extend(sent)
+                    continue
+                for i in sent[:pos]:
+                    results[i] = write_result(writes[i])
+                results[sent[pos]] = write_result(
+                    writes[sent[pos]], f"BACnet write failed: {err.errorType.errorClass}, {err.errorType.errorCode}"
+                )
+                pending.extend(sent[pos + 1 :])
+                continue
+            except ErrorRejectAbortNack as err:
+                if isinstance(err, RejectPDU) and err.apduAbortRejectReason == RejectReason.unrecognizedService:
+                    self._wpm_support[address] = False
+                pending.extend(sent)
+                continue
+
+            for i in sent:
+                results[i] = write_result(writes[i])
+        return pending
+
+    def _failed_position(self, err: WritePropertyMultipleError, sent: List[Dict[str, Any]]) -> Optional[int]:
+        """Position of the failed write, or None if the point was written more than once."""
+        failed = err.firstFailedWriteAttempt
+        if failed is None:
+            return None
+        matches = []
+        for pos, w in enumerate(sent):
+            prop_id, prop_index = self._parse_property_identifier(w.get("property_identifier", "present-value"))
+            if (
+                self._obj(w["object_identifier"]) == failed.objectIdentifier
+                and PropertyIdentifier(prop_id) == failed.propertyIdentifier
+                and prop_index == failed.propertyArrayIndex
+            ):
+                matches.append(pos)
+        return matches[0] if len(matches) == 1 else None
+
     async def rpm(self, address: str, *args: str) -> List[Dict[str, Any]]:
         assert self.app is not None, "BacpypesClient.start() must be called first"
 
@@ -97,9 +263,7 @@ class BacpypesClient(BacnetClient):
         if not args_list:
             raise ValueError("RPM requires at least an object identifier and one property")
 
-        address_obj = self._addr(address)
-        device_info = await self.app.device_info_cache.get_device_info(address_obj)
-        vendor_info = get_vendor_info(device_info.vendor_identifier if device_info else 0)
+        address_obj, vendor_info = await self.points.vendor_info(self.app, address)
 
         parameter_list: List[Any] = []
         while args_list:
@@ -136,16 +300,4 @@ class BacpypesClient(BacnetClient):
         except ErrorRejectAbortNack as err:
             return [{"error": f"Error during RPM: {err}"}]
 
-        out: List[Dict[str, Any]] = []
-        for (obj_id, prop_id, prop_index, prop_val) in response:
-            rec: Dict[str, Any] = {
-                "object_identifier": obj_id,
-                "property_identifier": prop_id,
-                "property_array_index": prop_index,
-            }
-            if isinstance(prop_val, ErrorType):
-                rec["value"] = f"Error: {prop_val.errorClass}, {prop_val.errorCode}"
-            else:
-                rec["value"] = prop_val
-            out.append(rec)
-        return out
+        return encode_rpm_response(response)
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# concurrent requests for read_many / rpm_many, in total and to one device
+DEFAULT_CONCURRENCY = 16
+DEFAULT_DEVICE_CONCURRENCY = 2
 
 
 class BacnetClient(ABC):
@@ -36,3 +43,168 @@ class BacnetClient(ABC):
     async def rpm(self, address: str, *args: str) -> List[Dict[str, Any]]:
         """ReadPropertyMultiple convenience wrapper."""
         raise NotImplementedError
+
+    async def write_many(self, writes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Perform many writes and return one status dict per write, in order.
+
+        Each write is a dict with ``address``, ``object_identifier``, ``value`` and
+        optionally ``priority`` and ``property_identifier``. Each result holds the
+        same identifiers plus ``status`` (``"success"`` / ``"error"``) and ``detail``.
+
+        The default runs ``write`` concurrently (writes to the same point stay in
+        order); backends override it to batch.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(writes)
+        groups: Dict[Tuple[str, str, str], List[int]] = {}
+        for i, w in enumerate(writes):
+            key = (str(w["address"]), w["object_identifier"], w.get("property_identifier", "present-value"))
+            groups.setdefault(key, []).append(i)
+
+        async def run(indexes: List[int]) -> None:
+            for i in indexes:
+                w = writes[i]
+                try:
+                    await self.write(
+                        w["address"],
+                        w["object_identifier"],
+                        w["value"],
+                        w.get("priority"),
+                        w.get("property_identifier", "present-value"),
+                    )
+                except Exception as e:  # noqa: BLE001
+                    results[i] = write_result(w, str(e))
+                else:
+                    results[i] = write_result(w)
+
+        await asyncio.gather(*(run(indexes) for indexes in groups.values()))
+        return results  # type: ignore[return-value]
+
+    async def read_many(
+        self,
+        reads: List[Dict[str, Any]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """Read many points across devices; one status dict per read, in order.
+
+        Each read is a dict with ``address``, ``object_identifier`` and optionally
+        ``property_identifier``. Each result holds the same identifiers plus
+        ``status`` (``"success"`` / ``"error"``), ``value`` and ``detail``.
+
+        The default runs ``read`` with at most ``concurrency`` requests in flight
+        (and ``DEFAULT_DEVICE_CONCURRENCY`` per device); backends override it to
+        batch.
+        """
+
+        async def one(r: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                value = await self.read(
+                    r["address"], r["object_identifier"], r.get("property_identifier", "present-value")
+                )
+            except Exception as e:  # noqa: BLE001
+                return read_result(r, error=str(e))
+            return read_result(r, value)
+
+        return await gather_bounded(reads, one, concurrency)
+
+    async def rpm_many(
+        self,
+        requests: List[Dict[str, Any]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """ReadPropertyMultiple against many devices; one status dict per request, in order.
+
+        Each request is ``{"address", "args"}`` with ``args`` as for ``rpm``. Each
+        result holds ``address``, ``status``, ``results`` (the RPM rows) and ``detail``.
+        Concurrency is bounded as in ``read_many``.
+        """
+
+        async def one(r: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                rows = await self.rpm(r["address"], *r["args"])
+            except Exception as e:  # noqa: BLE001
+                return rpm_result(r, error=str(e))
+            # some backends answer a failed RPM with a single error row
+            if len(rows) == 1 and isinstance(rows[0], dict) and set(rows[0]) == {"error"}:
+                return rpm_result(r, error=str(rows[0]["error"]))
+            return rpm_result(r, rows)
+
+        return await gather_bounded(requests, one, concurrency)
+
+    async def read_range(
+        self,
+        address: str,
+        object_identifier: str,
+        *,
+        range_type: str = "position",
+        reference: Any = None,
+        count: int = 100,
+        property_identifier: str = "log-buffer",
+    ) -> Dict[str, Any]:
+        """ReadRange over a trend log buffer.
+
+        ``range_type`` is ``"position"``, ``"sequence"`` or ``"time"`` (ISO date-time
+        ``reference``). Returns ``{"records": [...], "first_sequence", "last_sequence",
+        "more"}`` with records oldest first. Backends without ReadRange support raise
+        ``NotImplementedError``.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support ReadRange")
+
+
+def write_result(write: Dict[str, Any], error: Optional[str] = None) -> Dict[str, Any]:
+    """Status dict returned by ``BacnetClient.write_many`` for one write."""
+    return {
+        "address": write["address"],
+        "object_identifier": write["object_identifier"],
+        "property_identifier": write.get("property_identifier", "present-value"),
+        "status": "error" if error else "success",
+        "detail": error,
+    }
+
+
+def read_result(read: Dict[str, Any], value: Any = None, error: Optional[str] = None) -> Dict[str, Any]:
+    """Status dict returned by ``BacnetClient.read_many`` for one read."""
+    return {
+        "address": read["address"],
+        "object_identifier": read["object_identifier"],
+        "property_identifier": read.get("property_identifier", "present-value"),
+        "status": "error" if error else "success",
+        "value": None if error else value,
+        "detail": error,
+    }
+
+
+def rpm_result(
+    request: Dict[str, Any],
+    rows: Optional[List[Dict[str, Any]]] = None,
+    error: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Status dict returned by ``BacnetClient.rpm_many`` for one request."""
+    return {
+        "address": request["address"],
+        "status": "error" if error else "success",
+        "results": [] if error else rows,
+        "detail": error,
+    }
+
+
+async def gather_bounded(
+    items: Sequence[Dict[str, Any]],
+    func: Callable[[Dict[str, Any]], Awaitable[T]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    device_concurrency: int = DEFAULT_DEVICE_CONCURRENCY,
+) -> List[T]:
+    """``func(item)`` for every item, results in order.
+
+    At most ``concurrency`` calls run at once, and at most ``device_concurrency``
+    for one ``item["address"]``: small controllers handle few requests at a time,
+    so a long list for one device must not crowd out the others.
+    """
+    overall = asyncio.Semaphore(max(1, concurrency))
+    devices: Dict[str, asyncio.Semaphore] = {}
+
+    async def run(item: Dict[str, Any]) -> T:
+        device = devices.setdefault(str(item["address"]), asyncio.Semaphore(max(1, device_concurrency)))
+        async with device, overall:
+            return await func(item)
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
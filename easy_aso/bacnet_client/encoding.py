@@ -0,0 +1,175 @@
+"""Single-pass encoder from bacpypes3 values to JSON-native data.
+
+Matches the shapes diy-bacnet-server returns over JSON-RPC, so the gateway's
+``/read`` and ``/rpm`` answer with the same values as ``JsonRpcBacnetClient``:
+identifiers and enumerations as names, bit strings as lists of set bits,
+``AnyAtomic`` unwrapped, ``ErrorType`` as ``"Error: <class>, <code>"``. The
+encode function is picked once per class and cached.
+
+This is a copy of diy-bacnet-server's ``bacpypes_server/encoder.py``, since
+the two ship separately; tests/test_encoding.py checks that they agree.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List
+
+from bacpypes3.apdu import ErrorType
+from bacpypes3.constructeddata import Any as AnyValue, AnyAtomic, Sequence
+from bacpypes3.json.util import date_encode, octetstring_encode, taglist_to_json_list
+from bacpypes3.primitivedata import (
+    BitString,
+    Boolean,
+    CharacterString,
+    Date,
+    Double,
+    Enumerated,
+    Integer,
+    Null,
+    ObjectIdentifier,
+    OctetString,
+    Real,
+    Time,
+    Unsigned,
+    attr_to_asn1,
+)
+
+
+Encoder = Callable[[Any], Any]
+
+_NATIVE = (type(None), bool, int, float, str)
+
+# class -> encode function, filled on first sight of each class
+_encoders: Dict[type, Encoder] = {}
+
+
+def encode_value(value: Any) -> Any:
+    """Encode a bacpypes3 value (or plain Python data holding them)."""
+    cls = value.__class__
+    encoder = _encoders.get(cls)
+    if encoder is None:
+        encoder = _encoders[cls] = _resolve(cls)
+    return encoder(value)
+
+
+def encode_rpm_response(response) -> List[dict]:
+    """
+    Turn ``read_property_multiple`` tuples into the RPC result rows
+    (object and property identifiers as strings, values encoded).
+    """
+    result_list = []
+    for (
+        object_identifier,
+        property_identifier,
+        property_array_index,
+        property_value,
+    ) in response:
+        result_list.append(
+            {
+                "object_identifier": encode_value(object_identifier),
+                "property_identifier": encode_value(property_identifier),
+                "property_array_index": property_array_index,
+                "value": encode_value(property_value),
+            }
+        )
+    return result_list
+
+
+def _resolve(cls: type) -> Encoder:
+    if cls in _NATIVE:
+        return _identity
+
+    # atomic types, most common first
+    if issubclass(cls, Real) or issubclass(cls, Double):
+        return float
+    if issubclass(cls, Enumerated):
+        return _encode_enumerated
+    if issubclass(cls, Boolean):
+        return bool
+    if issubclass(cls, Unsigned) or issubclass(cls, Integer):
+        return int
+    if issubclass(cls, CharacterString):
+        return str
+    if issubclass(cls, BitString):
+        return _bitstring_encoder(cls)
+    if issubclass(cls, ObjectIdentifier):
+        return str
+    if issubclass(cls, Null):
+        return _encode_null
+    if issubclass(cls, OctetString):
+        return octetstring_encode
+    if issubclass(cls, Date):
+        return date_encode
+    if issubclass(cls, Time):
+        return str
+
+    # constructed types
+    if issubclass(cls, AnyAtomic):
+        return _encode_any_atomic
+    if issubclass(cls, AnyValue):
+        return _encode_any
+    if issubclass(cls, ErrorType):
+        return _encode_error
+    if issubclass(cls, Sequence):
+        return _sequence_encoder(cls)
+    if issubclass(cls, (list, tuple)):
+        return _encode_list
+    if issubclass(cls, dict):
+        return _encode_dict
+
+    raise TypeError(f"Unhandled type: {cls}")
+
+
+def _identity(value):
+    return value
+
+
+def _encode_null(value):
+    return []
+
+
+def _encode_enumerated(value):
+    return value.asn1
+
+
+def _encode_any_atomic(value):
+    return encode_value(value.get_value())
+
+
+def _encode_any(value):
+    return taglist_to_json_list(value.tagList)
+
+
+def _encode_error(value):
+    return f"Error: {value.errorClass}, {value.errorCode}"
+
+
+def _encode_list(value):
+    return [encode_value(item) for item in value]
+
+
+def _encode_dict(value):
+    return {key: encode_value(item) for key, item in value.items()}
+
+
+def _bitstring_encoder(cls: type) -> Encoder:
+    bit_names = {v: k for k, v in cls._bitstring_names.items()}
+
+    def encode(value):
+        return [bit_names.get(i, i) for i, bit in enumerate(value) if bit]
+
+    return encode
+
+
+def _sequence_encoder(cls: type) -> Encoder:
+    fields = [(attr, attr_to_asn1(attr)) for attr in cls._elements]
+
+    def encode(value):
+        result = {}
+        for attr, key in fields:
+            item = getattr(value, attr, None)
+            if item is not None:
+                result[key] = encode_value(item)
+        return result
+
+    return encode
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+import json
 import os
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
 import httpx
 
 from .base import BacnetClient
+from .transport import make_http_client
+
+TRANSPORTS = ("http", "ws")
+
+
+def parse_device_instance(address: str) -> int:
+    """Device instance from ``"3456789"`` or ``"device:3456789"``."""
+    s = str(address).strip()
+    if s.lower().startswith("device:"):
+        s = s.split(":", 1)[1].strip()
+    return int(s)
 
 
 class JsonRpcBacnetClient(BacnetClient):
@@ -19,6 +31,9 @@ class JsonRpcBacnetClient(BacnetClient):
 
     Default entrypoint for fastapi-jsonrpc is `/api`.
 
+    ``base_url`` may be ``unix:///path/to/rpc.sock`` when diy-bacnet-server runs on
+    the same host with ``--unix-socket``.
+
     When **diy-bacnet-server** has ``BACNET_RPC_API_KEY`` set, send the same value as
     ``Authorization: Bearer …`` on every JSON-RPC POST. The client reads (in order)
     ``bearer_token``, ``SUPERVISOR_BACNET_RPC_BEARER``, or ``BACNET_RPC_API_KEY`` from
@@ -33,7 +48,6 @@ class JsonRpcBacnetClient(BacnetClient):
         *,
         bearer_token: Optional[str] = None,
     ):
-        self.base_url = base_url.rstrip("/")
         self.entrypoint = entrypoint
         headers: Dict[str, str] = {}
         if bearer_token is not None:
@@ -47,17 +61,13 @@ class JsonRpcBacnetClient(BacnetClient):
         tok = raw_tok.strip()
         if tok:
             headers["Authorization"] = f"Bearer {tok}"
-        self._client = httpx.AsyncClient(timeout=timeout_s, headers=headers or None)
+        self.base_url, self._client = make_http_client(base_url, timeout=timeout_s, headers=headers or None)
 
     async def close(self) -> None:
         await self._client.aclose()
 
     def _device_instance(self, address: str) -> int:
-        # allow a couple convenient forms
-        s = str(address).strip()
-        if s.lower().startswith("device:"):
-            s = s.split(":", 1)[1].strip()
-        return int(s)
+        return parse_device_instance(address)
 
     async def _rpc(self, method: str, params: Dict[str, Any]) -> Any:
         payload = {
@@ -74,6 +84,10 @@ class JsonRpcBacnetClient(BacnetClient):
             raise RuntimeError(f"JSON-RPC error calling {method}: {data['error']}")
         return data.get("result")
 
+    async def hello(self) -> Any:
+        """``server_hello``; a cheap call to check that the gateway answers."""
+        return await self._rpc("server_hello", {})
+
     async def read(
         self,
         address: str,
@@ -118,6 +132,99 @@ class JsonRpcBacnetClient(BacnetClient):
             },
         )
 
+    async def write_many(self, writes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Batched writes via ``client_write_many``.
+
+        diy-bacnet-server groups them per device into WritePropertyMultiple where
+        the device supports it and falls back to concurrent WriteProperty.
+        """
+        if not writes:
+            return []
+        result = await self._rpc(
+            "client_write_many",
+            {
+                "request": {
+                    "writes": [
+                        {
+                            "device_instance": self._device_instance(w["address"]),
+                            "object_identifier": w["object_identifier"],
+                            "property_identifier": w.get("property_identifier", "present-value"),
+                            "value": w["value"],
+                            "priority": w.get("priority"),
+                        }
+                        for w in writes
+                    ]
+                }
+            },
+        )
+        rows = (result or {}).get("data", {}).get("results", [])
+        return [{**row, "address": w["address"]} for w, row in zip(writes, rows)]
+
+    async def read_range(
+        self,
+        address: str,
+        object_identifier: str,
+        *,
+        range_type: str = "position",
+        reference: Any = None,
+        count: int = 100,
+        property_identifier: str = "log-buffer",
+    ) -> Dict[str, Any]:
+        """ReadRange via ``client_read_range``; the server pages through the buffer."""
+        result = await self._rpc(
+            "client_read_range",
+            {
+                "request": {
+                    "device_instance": self._device_instance(address),
+                    "object_identifier": object_identifier,
+                    "property_identifier": property_identifier,
+                    "range_type": range_type,
+                    "reference": reference,
+                    "count": count,
+                }
+            },
+        )
+        return (result or {}).get("data") or {
+            "records": [],
+            "first_sequence": None,
+            "last_sequence": None,
+            "more": False,
+        }
+
+    async def subscribe_cov(
+        self, targets: Iterable[Tuple[str, str]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield COV events for ``(address, object_identifier)`` pairs.
+
+        Opens diy-bacnet-server's ``/stream/cov`` Server-Sent Events stream; the
+        server holds (and renews) one SubscribeCOV per pair and relays the
+        notifications. Each event is a dict with ``type`` ``"cov"``
+        (``property_identifier``, ``value``, ``timestamp``) or ``"status"``
+        (``state``: pending/active/retrying, ``error``), plus ``address`` and
+        ``object_identifier``. The subscription ends when the iterator is closed.
+        """
+        body = {
+            "targets": [
+                {
+                    "device_instance": self._device_instance(address),
+                    "object_identifier": object_identifier,
+                }
+                for address, object_identifier in targets
+            ]
+        }
+        # no read timeout: the server only sends keepalives between changes
+        timeout = httpx.Timeout(self._client.timeout.connect, read=None)
+        async with self._client.stream(
+            "POST", f"{self.base_url}/stream/cov", json=body, timeout=timeout
+        ) as r:
+            r.raise_for_status()
+            async for line in r.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                event = json.loads(line[5:])
+                event["address"] = str(event.pop("device_instance"))
+                yield event
+
     async def rpm(self, address: str, *args: str) -> List[Dict[str, Any]]:
         device_instance = self._device_instance(address)
 
@@ -148,3 +255,14 @@ class JsonRpcBacnetClient(BacnetClient):
                 return data.get("results", [])
         # fallback
         return result if isinstance(result, list) else []
+
+
+def make_jsonrpc_client(base_url: str, transport: str = "http", **kwargs: Any) -> JsonRpcBacnetClient:
+    """``JsonRpcBacnetClient`` for ``transport="http"``, or its WebSocket channel variant for ``"ws"``."""
+    if transport == "ws":
+        from .ws_client import WebSocketBacnetClient
+
+        return WebSocketBacnetClient(base_url, **kwargs)
+    if transport != "http":
+        raise ValueError(f"Unknown BACnet RPC transport {transport!r} (one of {', '.join(TRANSPORTS)})")
+    return JsonRpcBacnetClient(base_url, **kwargs)
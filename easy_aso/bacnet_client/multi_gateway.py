@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+
+from .base import BacnetClient, write_result
+from .jsonrpc_client import JsonRpcBacnetClient, make_jsonrpc_client, parse_device_instance
+from .transport import TransportNotConnected
+
+logger = logging.getLogger(__name__)
+
+# the request never reached the gateway, so even a write can go to another one
+_NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, TransportNotConnected)
+
+
+@dataclass(frozen=True)
+class GatewayRoute:
+    """One diy-bacnet-server and the device instances it serves.
+
+    ``ranges`` holds inclusive ``(low, high)`` device instance ranges. A gateway
+    without ranges is a catch-all for instances no other gateway claims.
+    """
+
+    base_url: str
+    ranges: Tuple[Tuple[int, int], ...] = ()
+
+    def serves(self, device_instance: int) -> bool:
+        return any(low <= device_instance <= high for low, high in self.ranges)
+
+
+def parse_gateway_routes(spec: str) -> Tuple[GatewayRoute, ...]:
+    """Parse ``"URL[=RANGES] URL[=RANGES] ..."`` (entries split by spaces or ``;``).
+
+    ``RANGES`` is a comma-separated list of instances or ``low-high`` ranges, e.g.
+    ``"http://gw-a:8080=1000-1999,5000 http://gw-b:8080=1000-1999 http://gw-c:8080"``.
+    Gateways listed with the same instances are equivalent and share the load.
+    """
+    routes: List[GatewayRoute] = []
+    for entry in re.split(r"[;\s]+", spec.strip()):
+        if not entry:
+            continue
+        url, _, raw_ranges = entry.partition("=")
+        ranges: List[Tuple[int, int]] = []
+        for part in filter(None, (p.strip() for p in raw_ranges.split(","))):
+            low, _, high = part.partition("-")
+            try:
+                rng = (int(low), int(high or low))
+            except ValueError:
+                raise ValueError(f"Invalid device instance range {part!r} for gateway {url!r}") from None
+            if rng[0] > rng[1]:
+                raise ValueError(f"Invalid device instance range {part!r} for gateway {url!r}")
+            ranges.append(rng)
+        routes.append(GatewayRoute(url.rstrip("/"), tuple(ranges)))
+    return tuple(routes)
+
+
+def _gateway_failed(exc: BaseException) -> bool:
+    """True when the gateway itself failed, not the BACnet request it relayed.
+
+    Read timeouts are left out: a slow device behind a healthy gateway looks the
+    same, and sending the request to an equivalent gateway would not help.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    if isinstance(exc, httpx.TimeoutException):
+        return isinstance(exc, _NOT_SENT)
+    # ConnectionError: a WebSocket channel that could not open or dropped
+    return isinstance(exc, (httpx.TransportError, ConnectionError))
+
+
+class _Gateway:
+    __slots__ = (
+        "route",
+        "client",
+        "outstanding",
+        "picks",
+        "healthy",
+        "failures",
+        "retry_at",
+        "last_error",
+        "probing",
+    )
+
+    def __init__(self, route: GatewayRoute, client: JsonRpcBacnetClient) -> None:
+        self.route = route
+        self.client = client
+        self.outstanding = 0
+        self.picks = 0
+        self.healthy = True
+        self.failures = 0
+        self.retry_at = 0.0
+        self.last_error: Optional[str] = None
+        self.probing = False
+
+
+class MultiGatewayBacnetClient(BacnetClient):
+    """JSON-RPC client spread over several diy-bacnet-server gateways.
+
+    Each call is routed by device instance (see :class:`GatewayRoute`). Among the
+    gateways that serve an instance, the one with the fewest requests in flight
+    is used. A gateway that refuses connections or answers 5xx is marked down and
+    the call moves to the next equivalent gateway: reads always, writes only when
+    the request was never sent. A down gateway is skipped for ``retry_after_s``
+    (doubling on each further failure, up to ``max_retry_after_s``), then must
+    answer a ``server_hello`` probe before it carries requests again. The probe
+    runs in the background while an equivalent gateway is healthy, and ahead of
+    the call when none is. When every gateway for an instance is down, they are
+    still tried rather than failing outright.
+
+    JSON-RPC and BACnet errors are the device's answer and are raised as is.
+    ``transport="ws"`` talks to every gateway over its WebSocket channel.
+    """
+
+    def __init__(
+        self,
+        routes: Sequence[GatewayRoute],
+        timeout_s: float = 15.0,
+        entrypoint: str = "/api",
+        *,
+        bearer_token: Optional[str] = None,
+        retry_after_s: float = 5.0,
+        max_retry_after_s: float = 60.0,
+        transport: str = "http",
+    ):
+        if not routes:
+            raise ValueError("MultiGatewayBacnetClient needs at least one gateway")
+        self.retry_after_s = retry_after_s
+        self.max_retry_after_s = max_retry_after_s
+        self._gateways = [
+            _Gateway(
+                route,
+                make_jsonrpc_client(
+                    route.base_url,
+                    transport,
+                    timeout_s=timeout_s,
+                    entrypoint=entrypoint,
+                    bearer_token=bearer_token,
+                ),
+            )
+            for route in routes
+        ]
+        self._catch_all = tuple(gw for gw in self._gateways if not gw.route.ranges)
+        self._routes: Dict[int, Tuple[_Gateway, ...]] = {}
+        self._probes: set = set()
+
+    async def close(self) -> None:
+        for task in self._probes:
+            task.cancel()
+        await asyncio.gather(*self._probes, return_exceptions=True)
+        for gw in self._gateways:
+            await gw.client.close()
+
+    # ---- routing and health -------------------------------------------------
+
+    def _route(self, address: str) -> Tuple[_Gateway, ...]:
+        instance = parse_device_instance(address)
+        group = self._routes.get(instance)
+        if group is None:
+            group = tuple(gw for gw in self._gateways if gw.route.serves(instance)) or self._catch_all
+            if not group:
+                raise LookupError(f"No BACnet gateway is configured for device instance {instance}")
+            self._routes[instance] = group
+        return group
+
+    def _ordered(self, group: Sequence[_Gateway]) -> List[_Gateway]:
+        """Healthy gateways by load, then down gateways due for a retry, then the rest."""
+        now = time.monotonic()
+        healthy = sorted((gw for gw in group if gw.healthy), key=lambda gw: (gw.outstanding, gw.picks))
+        down = sorted((gw for gw in group if not gw.healthy), key=lambda gw: gw.retry_at)
+        due = [gw for gw in down if gw.retry_at <= now]
+        return healthy + due + [gw for gw in down if gw.retry_at > now]
+
+    def _mark_up(self, gw: _Gateway) -> None:
+        if not gw.healthy:
+            logger.info("BACnet gateway %s is back", gw.route.base_url)
+        gw.healthy = True
+        gw.failures = 0
+        gw.last_error = None
+
+    def _mark_down(self, gw: _Gateway, exc: BaseException) -> None:
+        gw.failures += 1
+        delay = min(self.retry_after_s * 2 ** (gw.failures - 1), self.max_retry_after_s)
+        gw.retry_at = time.monotonic() + delay
+        gw.last_error = str(exc) or type(exc).__name__
+        if gw.healthy:
+            logger.warning("BACnet gateway %s is down: %s", gw.route.base_url, gw.last_error)
+        gw.healthy = False
+
+    async def _probe(self, gw: _Gateway) -> bool:
+        gw.probing = True
+        try:
+            await gw.client.hello()
+        except Exception as exc:  # noqa: BLE001
+            self._mark_down(gw, exc)
+            return False
+        finally:
+            gw.probing = False
+        self._mark_up(gw)
+        return True
+
+    def _probe_due(self, group: Sequence[_Gateway]) -> None:
+        """Start background probes of due gateways that have a healthy peer to cover for them."""
+        if not any(gw.healthy for gw in group):
+            return
+        now = time.monotonic()
+        for gw in group:
+            if not gw.healthy and not gw.probing and gw.retry_at <= now:
+                gw.probing = True
+                task = asyncio.ensure_future(self._probe(gw))
+                self._probes.add(task)
+                task.add_done_callback(self._probes.discard)
+
+    async def _usable(self, gw: _Gateway) -> bool:
+        # a down gateway whose retry time has come must answer a probe first
+        # (or is being probed already); one that is not due yet is only
+        # reached when nothing else is left
+        if gw.healthy:
+            return True
+        if gw.probing:
+            return False
+        if gw.retry_at > time.monotonic():
+            return True
+        return await self._probe(gw)
+
+    async def _call(self, address: str, method: str, *args: Any, idempotent: bool = True, **kwargs: Any) -> Any:
+        group = self._route(address)
+        self._probe_due(group)
+        last_exc: Optional[BaseException] = None
+        for gw in self._ordered(group):
+            if not await self._usable(gw):
+                continue
+            gw.outstanding += 1
+            gw.picks += 1
+            try:
+                result = await getattr(gw.client, method)(*args, **kwargs)
+            except Exception as exc:
+                if not _gateway_failed(exc):
+                    raise
+                self._mark_down(gw, exc)
+                if not idempotent and not isinstance(exc, _NOT_SENT):
+                    raise
+                last_exc = exc
+            else:
+                self._mark_up(gw)
+                return result
+            finally:
+                gw.outstanding -= 1
+        if last_exc is not None:
+            raise last_exc
+        raise ConnectionError(f"No BACnet gateway answered for device {address}")
+
+    async def check_health(self) -> Dict[str, bool]:
+        """Probe every gateway now; returns ``{base_url: healthy}``."""
+        results = await asyncio.gather(*(self._probe(gw) for gw in self._gateways))
+        return {gw.route.base_url: ok for gw, ok in zip(self._gateways, results)}
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Per-gateway state for diagnostics."""
+        now = time.monotonic()
+        return [
+            {
+                "base_url": gw.route.base_url,
+                "ranges": [list(r) for r in gw.route.ranges],
+                "healthy": gw.healthy,
+                "outstanding": gw.outstanding,
+                "requests": gw.picks,
+                "retry_in_s": None if gw.healthy else max(0.0, round(gw.retry_at - now, 3)),
+                "last_error": gw.last_error,
+            }
+            for gw in self._gateways
+        ]
+
+    # ---- BacnetClient -------------------------------------------------------
+
+    async def read(
+        self,
+        address: str,
+        object_identifier: str,
+        property_identifier: str = "present-value",
+    ) -> Any:
+        return await self._call(address, "read", address, object_identifier, property_identifier)
+
+    async def write(
+        self,
+        address: str,
+        object_identifier: str,
+        value: Any,
+        priority: Optional[int] = None,
+        property_identifier: str = "present-value",
+    ) -> None:
+        await self._call(
+            address,
+            "write",
+            address,
+            object_identifier,
+            value,
+            priority,
+            property_identifier,
+            idempotent=False,
+        )
+
+    async def rpm(self, address: str, *args: str) -> List[Dict[str, Any]]:
+        return await self._call(address, "rpm", address, *args)
+
+    async def read_range(
+        self,
+        address: str,
+        object_identifier: str,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        return await self._call(address, "read_range", address, object_identifier, **kwargs)
+
+    async def write_many(self, writes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One ``client_write_many`` per gateway group, sent concurrently, results in order.
+
+        A group whose call fails (no gateway reachable, JSON-RPC error) gets an
+        error row per write; the other groups' results are still returned.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(writes)
+        groups: Dict[Tuple[_Gateway, ...], List[int]] = {}
+        for i, w in enumerate(writes):
+            try:
+                group = self._route(w["address"])
+            except (LookupError, ValueError) as e:
+                results[i] = write_result(w, str(e))
+                continue
+            groups.setdefault(group, []).append(i)
+
+        async def run(indexes: List[int]) -> None:
+            batch = [writes[i] for i in indexes]
+            try:
+                rows = await self._call(batch[0]["address"], "write_many", batch, idempotent=False)
+            except Exception as e:  # noqa: BLE001
+                logger.warning("write_many of %d writes failed: %s", len(batch), e)
+                rows = [write_result(w, str(e)) for w in batch]
+            for i, row in zip(indexes, rows):
+                results[i] = row
+
+        await asyncio.gather(*(run(indexes) for indexes in groups.values()))
+        return results  # type: ignore[return-value]
+
+    async def _subscribe_group(
+        self, group: Tuple[_Gateway, ...], targets: List[Tuple[str, str]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        # fail over until a gateway has accepted the stream, then stay on it
+        self._probe_due(group)
+        last_exc: Optional[BaseException] = None
+        for gw in self._ordered(group):
+            if not await self._usable(gw):
+                continue
+            stream = gw.client.subscribe_cov(targets)
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                return
+            except Exception as exc:
+                await stream.aclose()
+                if not _gateway_failed(exc):
+                    raise
+                self._mark_down(gw, exc)
+                last_exc = exc
+                continue
+            self._mark_up(gw)
+            try:
+                yield first
+                async for event in stream:
+                    yield event
+            finally:
+                await stream.aclose()
+            return
+        if last_exc is not None:
+            raise last_exc
+        raise ConnectionError("No BACnet gateway accepted the COV subscription")
+
+    async def subscribe_cov(
+        self, targets: Iterable[Tuple[str, str]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """COV events as in :meth:`JsonRpcBacnetClient.subscribe_cov`, one stream per gateway group."""
+        groups: Dict[Tuple[_Gateway, ...], List[Tuple[str, str]]] = {}
+        for address, object_identifier in targets:
+            groups.setdefault(self._route(address), []).append((address, object_identifier))
+        if len(groups) == 1:
+            ((group, group_targets),) = groups.items()
+            async for event in self._subscribe_group(group, group_targets):
+                yield event
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def pump(group: Tuple[_Gateway, ...], group_targets: List[Tuple[str, str]]) -> None:
+            try:
+                async for event in self._subscribe_group(group, group_targets):
+                    await queue.put(event)
+            except Exception as exc:  # noqa: BLE001
+                await queue.put(exc)
+            else:
+                await queue.put(done)
+
+        tasks = [asyncio.ensure_future(pump(g, t)) for g, t in groups.items()]
+        try:
+            running = len(tasks)
+            while running:
+                item = await queue.get()
+                if item is done:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
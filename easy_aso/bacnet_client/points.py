@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bacpypes3.apdu import PropertyReference
+from bacpypes3.pdu import Address
+from bacpypes3.primitivedata import ObjectIdentifier
+from bacpypes3.vendor import get_vendor_info
+
+DEFAULT_POINT_CACHE_SIZE = 4096
+
+
+def parse_property_identifier(property_identifier: str) -> Tuple[str, Optional[int]]:
+    """``"priority-array,8"`` -> ``("priority-array", 8)``; no index -> ``(prop, None)``."""
+    if "," in property_identifier:
+        prop_id, prop_index = property_identifier.split(",")
+        return prop_id.strip(), int(prop_index.strip())
+    return property_identifier, None
+
+
+@dataclass(eq=False)
+class PointHandle:
+    """One BACnet property, parsed once and reused for every read, write and RPM.
+
+    ``address``, ``object_identifier`` and ``property_identifier`` are the
+    strings it was made from. ``address_obj`` is parsed on first use, since an
+    RPC gateway takes device instances that are not BACnet addresses. The
+    ``vendor_info``, ``object_class`` and ``property_reference`` fields are
+    filled in by :meth:`PointCache.resolve` from the device's vendor, which
+    needs the application's device-info cache.
+    """
+
+    address: str
+    object_identifier: str
+    property_identifier: str
+    object_id: ObjectIdentifier
+    property_id: str
+    array_index: Optional[int]
+    vendor_info: Any = None
+    object_class: Optional[type] = None
+    property_reference: Optional[PropertyReference] = None
+    _address_obj: Optional[Address] = field(default=None, repr=False)
+
+    @property
+    def address_obj(self) -> Address:
+        if self._address_obj is None:
+            self._address_obj = Address(self.address)
+        return self._address_obj
+
+    @property
+    def resolved(self) -> bool:
+        return self.vendor_info is not None
+
+
+class PointCache:
+    """LRU of :class:`PointHandle` keyed by ``(address, object, property)`` strings.
+
+    Agents that keep handles skip the cache entirely; calls made with strings
+    look their handle up here, so a point polled every step is parsed once.
+    Vendor info is also kept per address for RPMs built from strings. Call
+    :meth:`invalidate` after a device is replaced (new vendor or address).
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_POINT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._handles: "OrderedDict[Tuple[str, str, str], PointHandle]" = OrderedDict()
+        self._vendors: Dict[str, Tuple[Address, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    def handle(
+        self, address: str, object_identifier: str, property_identifier: str = "present-value"
+    ) -> PointHandle:
+        key = (str(address), object_identifier, property_identifier)
+        handle = self._handles.get(key)
+        if handle is not None:
+            self._handles.move_to_end(key)
+            self.hits += 1
+            return handle
+        self.misses += 1
+        handle = make_handle(*key)
+        self._handles[key] = handle
+        while len(self._handles) > self.maxsize:
+            self._handles.popitem(last=False)
+        return handle
+
+    async def vendor_info(self, app, address: str) -> Tuple[Address, Any]:
+        """``(Address, vendor info)`` for ``address``, looked up once per device."""
+        address = str(address)
+        entry = self._vendors.get(address)
+        if entry is None:
+            address_obj = Address(address)
+            device_info = await app.device_info_cache.get_device_info(address_obj)
+            entry = (address_obj, get_vendor_info(device_info.vendor_identifier if device_info else 0))
+            self._vendors[address] = entry
+        return entry
+
+    async def resolve(self, app, handle: PointHandle) -> PointHandle:
+        """Fill in the handle's vendor fields (once); raise ``ValueError`` for unknown types."""
+        if handle.resolved:
+            return handle
+        address_obj, vendor_info = await self.vendor_info(app, handle.address)
+        handle._address_obj = address_obj
+        object_class = vendor_info.get_object_class(handle.object_id[0])
+        if not object_class:
+            raise ValueError(f"Unrecognized object type: {handle.object_id}")
+        reference = PropertyReference(propertyIdentifier=handle.property_id, vendor_info=vendor_info)
+        if handle.array_index is not None:
+            reference.propertyArrayIndex = handle.array_index
+        handle.object_class = object_class
+        handle.property_reference = reference
+        handle.vendor_info = vendor_info
+        return handle
+
+    def invalidate(self, address: Optional[str] = None) -> None:
+        """Drop every handle and vendor entry, or only those for one device address."""
+        if address is None:
+            self._handles.clear()
+            self._vendors.clear()
+            return
+        address = str(address)
+        self._vendors.pop(address, None)
+        for key in [k for k in self._handles if k[0] == address]:
+            del self._handles[key]
+
+
+def make_handle(address: str, object_identifier: str, property_identifier: str = "present-value") -> PointHandle:
+    """Parse a point's strings into an unresolved :class:`PointHandle`."""
+    object_type, instance_number = object_identifier.split(",")
+    prop_id, array_index = parse_property_identifier(property_identifier)
+    return PointHandle(
+        address=str(address),
+        object_identifier=object_identifier,
+        property_identifier=property_identifier,
+        object_id=ObjectIdentifier((object_type.strip(), int(instance_number.strip()))),
+        property_id=prop_id,
+        array_index=array_index,
+    )
+
+
+def rpm_parameters(handles: Iterable[PointHandle]) -> List[Any]:
+    """``read_property_multiple`` parameter list for resolved handles on one device.
+
+    Consecutive handles on the same object share one object entry.
+    """
+    parameters: List[Any] = []
+    last: Optional[ObjectIdentifier] = None
+    for handle in handles:
+        if handle.property_reference is None:
+            raise ValueError(f"Point {handle.object_identifier} {handle.property_identifier} is not resolved")
+        if handle.object_id != last:
+            parameters.append(handle.object_id)
+            parameters.append([])
+            last = handle.object_id
+        parameters[-1].append(handle.property_reference)
+    return parameters
@@ -2,17 +2,34 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-import httpx
+from .base import DEFAULT_CONCURRENCY, BacnetClient
+from .transport import make_http_client
 
-from .base import BacnetClient
+# bacnet-gateway limits per batch call; larger batches are sent in chunks
+MAX_READS_PER_CALL = 2000
+MAX_RPMS_PER_CALL = 500
+MAX_WRITES_PER_CALL = 2000
+MAX_CONCURRENCY = 64
+
+
+def _chunks(items: List[Dict[str, Any]], size: int) -> List[List[Dict[str, Any]]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
 
 
 class RemoteBacnetClient(BacnetClient):
-    """BACnet client that talks to a shared bacnet-gateway over HTTP."""
+    """BACnet client that talks to a shared bacnet-gateway over HTTP.
+
+    ``base_url`` may be ``unix:///path/to/gateway.sock`` for a gateway on the same
+    host listening on a Unix socket.
+
+    Each request tells the gateway ``timeout_s`` as its deadline, so the gateway
+    drops queued work this client has stopped waiting for.
+    """
 
     def __init__(self, base_url: str, timeout_s: float = 10.0):
-        self.base_url = base_url.rstrip("/")
-        self._client = httpx.AsyncClient(timeout=timeout_s)
+        self.base_url, self._client = make_http_client(
+            base_url, timeout=timeout_s, headers={"X-Request-Timeout": str(timeout_s)}
+        )
 
     async def close(self) -> None:
         await self._client.aclose()
@@ -54,6 +71,18 @@ class RemoteBacnetClient(BacnetClient):
         )
         r.raise_for_status()
 
+    async def write_many(self, writes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """``/write_many`` calls of up to MAX_WRITES_PER_CALL, one after the other to keep the order."""
+        results: List[Dict[str, Any]] = []
+        for chunk in _chunks(writes, MAX_WRITES_PER_CALL):
+            r = await self._client.post(
+                f"{self.base_url}/write_many",
+                json={"writes": chunk},
+            )
+            r.raise_for_status()
+            results.extend(r.json().get("results", []))
+        return results
+
     async def rpm(self, address: str, *args: str) -> List[Dict[str, Any]]:
         r = await self._client.post(
             f"{self.base_url}/rpm",
@@ -64,3 +93,46 @@ class RemoteBacnetClient(BacnetClient):
         )
         r.raise_for_status()
         return r.json().get("results", [])
+
+    async def read_many(
+        self,
+        reads: List[Dict[str, Any]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        ``/read_many`` calls of up to MAX_READS_PER_CALL reads, one after the
+        other; the gateway runs each call's reads concurrently.
+        """
+        concurrency = max(1, min(concurrency, MAX_CONCURRENCY))
+        results: List[Dict[str, Any]] = []
+        for chunk in _chunks(reads, MAX_READS_PER_CALL):
+            r = await self._client.post(
+                f"{self.base_url}/read_many",
+                json={"reads": chunk, "concurrency": concurrency},
+            )
+            r.raise_for_status()
+            results.extend(r.json().get("results", []))
+        return results
+
+    async def rpm_many(
+        self,
+        requests: List[Dict[str, Any]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        ``/rpm_many`` calls of up to MAX_RPMS_PER_CALL RPMs, one after the
+        other; the gateway runs each call's RPMs concurrently.
+        """
+        concurrency = max(1, min(concurrency, MAX_CONCURRENCY))
+        results: List[Dict[str, Any]] = []
+        for chunk in _chunks(requests, MAX_RPMS_PER_CALL):
+            r = await self._client.post(
+                f"{self.base_url}/rpm_many",
+                json={
+                    "requests": [{"address": q["address"], "args": list(q["args"])} for q in chunk],
+                    "concurrency": concurrency,
+                },
+            )
+            r.raise_for_status()
+            results.extend(r.json().get("results", []))
+        return results
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any, Optional, Tuple
+
+import httpx
+
+UNIX_SCHEME = "unix://"
+
+
+class TransportNotConnected(ConnectionError):
+    """The request was never sent: the connection to the gateway could not be used."""
+
+
+def split_unix_url(url: str) -> Tuple[Optional[str], str]:
+    """Socket path and HTTP base URL for a ``unix://`` URL.
+
+    ``unix:///run/bacnet/rpc.sock`` gives ``("/run/bacnet/rpc.sock", "http://localhost")``;
+    any other URL gives ``(None, url)``.
+    """
+    if not url.startswith(UNIX_SCHEME):
+        return None, url
+    path = url[len(UNIX_SCHEME):]
+    if not path:
+        raise ValueError(f"No socket path in {url!r}")
+    return path, "http://localhost"
+
+
+def make_http_client(url: str, **kwargs: Any) -> Tuple[str, httpx.AsyncClient]:
+    """``(base_url, client)`` for ``url``, over a Unix domain socket for ``unix://`` URLs.
+
+    Agents on the same host as the gateway skip the TCP stack that way; the
+    requests themselves are plain HTTP either way.
+    """
+    path, base_url = split_unix_url(url.rstrip("/"))
+    if path is not None:
+        kwargs["transport"] = httpx.AsyncHTTPTransport(uds=path)
+    return base_url, httpx.AsyncClient(**kwargs)
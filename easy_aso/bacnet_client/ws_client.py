@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, Optional
+
+from .jsonrpc_client import JsonRpcBacnetClient
+from .transport import TransportNotConnected, split_unix_url
+
+try:
+    from websockets.asyncio.client import connect, unix_connect
+    from websockets.exceptions import ConnectionClosed
+except ImportError:  # optional: pip install "easy-aso[channel]"
+    connect = unix_connect = None
+    ConnectionClosed = OSError
+
+try:
+    import msgpack
+except ImportError:  # optional: JSON frames instead
+    msgpack = None
+
+SUBPROTOCOLS = {"msgpack": "bacnet-rpc.msgpack", "json": "bacnet-rpc.json"}
+
+
+def _encode(encoding: str, message: Dict[str, Any]):
+    if encoding == "msgpack":
+        return msgpack.packb(message)
+    return json.dumps(message, separators=(",", ":"))
+
+
+def _decode(encoding: str, data) -> Any:
+    if encoding == "msgpack":
+        return msgpack.unpackb(data)
+    return json.loads(data)
+
+
+class WebSocketBacnetClient(JsonRpcBacnetClient):
+    """:class:`JsonRpcBacnetClient` whose calls share one WebSocket channel.
+
+    diy-bacnet-server's ``/ws`` channel carries many calls at once, matched by
+    id, so concurrent reads and writes do not each pay for an HTTP request.
+    Bodies are MessagePack when ``msgpack`` is installed (``encoding="msgpack"``)
+    and compact JSON otherwise. ``read``/``write``/``rpm``/``write_many``/
+    ``read_range`` behave exactly as over HTTP; ``subscribe_cov`` still uses the
+    HTTP event stream.
+
+    The channel opens on the first call and reopens on the next call after it
+    drops. Calls in flight when it drops raise ``ConnectionResetError``; a call
+    that could not be sent at all raises ``TransportNotConnected``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout_s: float = 15.0,
+        entrypoint: str = "/api",
+        *,
+        bearer_token: Optional[str] = None,
+        encoding: Optional[str] = None,
+        path: str = "/ws",
+    ):
+        if connect is None:
+            raise RuntimeError('WebSocketBacnetClient needs websockets: pip install "easy-aso[channel]"')
+        encoding = encoding or ("msgpack" if msgpack is not None else "json")
+        if encoding not in SUBPROTOCOLS:
+            raise ValueError(f"Unknown channel encoding {encoding!r} (msgpack or json)")
+        if encoding == "msgpack" and msgpack is None:
+            raise RuntimeError('encoding="msgpack" needs msgpack: pip install "easy-aso[channel]"')
+        super().__init__(base_url, timeout_s, entrypoint, bearer_token=bearer_token)
+        self._unix_path, http_base = split_unix_url(base_url.rstrip("/"))
+        scheme = "wss" if http_base.startswith("https:") else "ws"
+        self._ws_url = scheme + http_base[http_base.index(":") :] + path
+        self._timeout_s = timeout_s
+        self.encoding = encoding
+        self._conn: Any = None
+        self._conn_encoding = encoding
+        self._reader: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+        await super().close()
+
+    async def _connection(self) -> Any:
+        async with self._connect_lock:
+            if self._conn is not None:
+                return self._conn
+            # offer the preferred encoding first; the server may only have JSON
+            offer = [SUBPROTOCOLS[self.encoding]]
+            if self.encoding != "json":
+                offer.append(SUBPROTOCOLS["json"])
+            kwargs: Dict[str, Any] = {
+                "subprotocols": offer,
+                "additional_headers": {
+                    k: v for k, v in self._client.headers.items() if k.lower() == "authorization"
+                },
+                # frames are small and latency matters more than bytes here
+                "compression": None,
+                "open_timeout": self._timeout_s,
+                "max_size": None,
+            }
+            try:
+                if self._unix_path is not None:
+                    conn = await unix_connect(self._unix_path, self._ws_url, **kwargs)
+                else:
+                    conn = await connect(self._ws_url, **kwargs)
+            except Exception as exc:
+                raise TransportNotConnected(f"Could not open channel {self._ws_url}: {exc}") from exc
+            self._conn_encoding = "msgpack" if conn.subprotocol == SUBPROTOCOLS["msgpack"] else "json"
+            self._conn = conn
+            self._reader = asyncio.ensure_future(self._read(conn))
+            return conn
+
+    async def _read(self, conn: Any) -> None:
+        try:
+            async for data in conn:
+                message = _decode(self._conn_encoding, data)
+                future = self._pending.get(message.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except ConnectionClosed:
+            pass
+        finally:
+            if self._conn is conn:
+                self._conn = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionResetError(f"Channel {self._ws_url} closed"))
+
+    async def _rpc(self, method: str, params: Dict[str, Any]) -> Any:
+        conn = await self._connection()
+        call_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[call_id] = future
+        try:
+            try:
+                await conn.send(_encode(self._conn_encoding, {"id": call_id, "method": method, "params": params}))
+            except ConnectionClosed as exc:
+                raise TransportNotConnected(f"Channel {self._ws_url} closed: {exc}") from exc
+            response = await asyncio.wait_for(future, self._timeout_s)
+        finally:
+            self._pending.pop(call_id, None)
+        if "error" in response:
+            raise RuntimeError(f"JSON-RPC error calling {method}: {response['error']}")
+        return response.get("result")
@@ -1,7 +1,9 @@
 import asyncio
+import os
 import signal
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Dict, Iterable, List, Optional
 from bacpypes3.pdu import Address
 from bacpypes3.primitivedata import ObjectIdentifier, Null
 from bacpypes3.apdu import (
@@ -15,7 +17,31 @@ from bacpypes3.app import Application
 from bacpypes3.argparse import SimpleArgumentParser
 from bacpypes3.local.cmd import Commandable
 from bacpypes3.local.binary import BinaryValueObject
-from bacpypes3.vendor import get_vendor_info
+
+from easy_aso.bacnet_client.base import write_result
+from easy_aso.bacnet_client.bacpypes_client import BacpypesClient
+from easy_aso.bacnet_client.points import (
+    PointCache,
+    PointHandle,
+    parse_property_identifier,
+    rpm_parameters,
+)
+from easy_aso.overrides import OverrideRegistry
+from easy_aso.snapshot import (
+    PointSnapshot,
+    Subscription,
+    next_snapshot,
+    point_key,
+    rpm_row_values,
+)
+
+
+def _write_priority(write: Dict[str, Any]) -> Dict[str, Any]:
+    # bacnet_write takes -1 for "no priority"; write_many dicts use None
+    priority = write.get("priority")
+    if priority is not None and int(priority) < 0:
+        return dict(write, priority=None)
+    return write
 
 
 class CommandableBinaryValueObject(Commandable, BinaryValueObject):
@@ -49,11 +75,23 @@ class EasyASO(ABC):
         self.args = args or parser.parse_args()  # Parse args if not provided
         self.stop_event = asyncio.Event()  # Used to handle stop signal
         self._stop_handler_called = False  # Flag to prevent multiple calls
+        self._shutdown_task = None  # on_stop + override release, run once
 
         # Set the flag for no BACnet server mode
         self.no_bacnet_server = self.args.no_bacnet_server
         print(f"INFO: Arguments: {self.args}")
 
+        # Parsed points for string-based bacnet_read / bacnet_write calls
+        self.points = PointCache()
+
+        # Points polled before each step (subscribe_points) and their latest values
+        self._subscriptions: Dict[tuple, Subscription] = {}
+        self.snapshot = PointSnapshot()
+
+        # Overrides this agent holds; released on stop, persisted when a path is set
+        self.overrides = OverrideRegistry(os.environ.get("EASY_ASO_OVERRIDE_REGISTRY"))
+        self.release_deadline_s = float(os.environ.get("EASY_ASO_RELEASE_DEADLINE_S", "8"))
+
         # Real BACnet object is created in create_application (needs running loop).
         self.optimization_enabled_bv = _OptimizationKillSwitchPlaceholder()
         print(
@@ -109,13 +147,34 @@ class EasyASO(ABC):
     async def run_lifecycle(self):
         """Runs the on_start, on_step, on_stop lifecycle."""
         try:
+            if len(self.overrides):
+                # a previous run stopped without releasing these
+                print(f"INFO: Releasing {len(self.overrides)} overrides left by a previous run.")
+                await self.release_overrides()
             await self.on_start()
             while not self.stop_event.is_set():
+                if self._subscriptions:
+                    await self.refresh_points()
                 await self.on_step()
         except asyncio.CancelledError:
             print("INFO: run_lifecycle task cancelled.")
         finally:
-            await self.on_stop()
+            await self._shutdown()
+
+    async def _shutdown(self):
+        """
+        on_stop, then release_overrides, once per agent. The stop handler and
+        the end of run_lifecycle both get here on a signal; the second caller
+        waits for the first instead of releasing again.
+        """
+        if self._shutdown_task is None:
+            self._shutdown_task = asyncio.ensure_future(self._stop_and_release())
+        # shield: the stop handler cancels run_lifecycle while this may still run
+        await asyncio.shield(self._shutdown_task)
+
+    async def _stop_and_release(self):
+        await self.on_stop()
+        await self.release_overrides()
 
     async def stop_handler(self):
         """Stop handler triggered by signals."""
@@ -124,7 +183,7 @@ class EasyASO(ABC):
         self._stop_handler_called = True
         print("Stop handler triggered.")
         self.stop_event.set()
-        await self.on_stop()
+        await self._shutdown()
 
         # Cancel all tasks except the current one
         tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
@@ -157,9 +216,8 @@ class EasyASO(ABC):
             # Clean up: Remove signal handlers
             for sig in (signal.SIGINT, signal.SIGTERM):
                 loop.remove_signal_handler(sig)
-            # Ensure on_stop is called
-            if not self._stop_handler_called:
-                await self.on_stop()
+            # Ensure on_stop is called (a no-op if it already ran)
+            await self._shutdown()
 
     def _convert_to_address(self, address: str) -> Address:
         """
@@ -175,11 +233,81 @@ class EasyASO(ABC):
         return ObjectIdentifier((object_type.strip(), int(instance_number.strip())))
 
     def parse_property_identifier(self, property_identifier):
-        # Example parsing logic (modify as needed for your use case)
-        if "," in property_identifier:
-            prop_id, prop_index = property_identifier.split(",")
-            return prop_id.strip(), int(prop_index.strip())
-        return property_identifier, None
+        return parse_property_identifier(property_identifier)
+
+    # Max points per ReadPropertyMultiple when polling subscriptions
+    poll_rpm_max_points = 50
+
+    def subscribe_points(self, points, interval_s: float = 60.0) -> List[PointHandle]:
+        """
+        Poll these points every interval_s seconds, just before on_step, and
+        keep them in self.snapshot. Points are handles from point() or
+        (address, object_identifier[, property_identifier]) tuples. Subscribing
+        a point again changes its interval. Returns the handles.
+        """
+        handles = []
+        for p in points:
+            handle = p if isinstance(p, PointHandle) else self.point(*point_key(p))
+            self._subscriptions[point_key(handle)] = Subscription(handle, float(interval_s))
+            handles.append(handle)
+        return handles
+
+    def unsubscribe_points(self, points):
+        """
+        Stop polling these points and drop them from the snapshot.
+        """
+        for p in points:
+            self._subscriptions.pop(point_key(p), None)
+        self.snapshot = next_snapshot(self.snapshot, self._subscriptions, {}, time.time())
+
+    async def refresh_points(self, force: bool = False) -> PointSnapshot:
+        """
+        Poll the subscribed points that are due (all of them with force=True)
+        with as few RPMs as possible: one per device, split only past
+        poll_rpm_max_points. Devices are polled concurrently. The new snapshot
+        replaces self.snapshot in one go once every device has answered.
+        """
+        now = time.monotonic()
+        by_device: Dict[str, List[PointHandle]] = {}
+        for sub in self._subscriptions.values():
+            if force or sub.next_due <= now:
+                sub.next_due = now + sub.interval_s
+                by_device.setdefault(sub.point.address, []).append(sub.point)
+
+        polled = {}
+        results = await asyncio.gather(
+            *(self._poll_device(points) for points in by_device.values())
+        )
+        for answers in results:
+            polled.update(answers)
+        self.snapshot = next_snapshot(
+            self.snapshot, self._subscriptions, polled, time.time()
+        )
+        return self.snapshot
+
+    async def _poll_device(self, points: List[PointHandle]) -> Dict[tuple, tuple]:
+        # properties of one object go together; a local RPM names each object once
+        points = sorted(points, key=lambda p: p.object_identifier)
+        answers = {}
+        for start in range(0, len(points), self.poll_rpm_max_points):
+            chunk = points[start : start + self.poll_rpm_max_points]
+            try:
+                values = rpm_row_values(chunk, await self.rpm_points(chunk))
+            except Exception as e:
+                values = [(None, str(e))] * len(chunk)
+            read_at = time.time()
+            for p, (value, error) in zip(chunk, values):
+                answers[point_key(p)] = (value, error, read_at)
+        return answers
+
+    def point(
+        self, address: str, object_identifier: str, property_identifier="present-value"
+    ) -> PointHandle:
+        """
+        Parse a point once into a handle for read_point / write_point / rpm_points.
+        Handles are cached, so calling this every step is cheap too.
+        """
+        return self.points.handle(address, object_identifier, property_identifier)
 
     async def bacnet_read(
         self, address: str, object_identifier: str, property_identifier="present-value"
@@ -189,10 +317,26 @@ class EasyASO(ABC):
         Uses 'present-value' as default property identifier.
         """
         try:
-            address_obj = self._convert_to_address(address)
-            object_id_obj = self._convert_to_object_identifier(object_identifier)
+            handle = self.point(address, object_identifier, property_identifier)
+        except Exception as e:
+            print(
+                f"ERROR: Unexpected error while reading property: {e} - Address: {address}, "
+                f"Object ID: {object_identifier}, Property Identifier: {property_identifier}"
+            )
+            return None
+        return await self.read_point(handle)
+
+    async def read_point(self, point: PointHandle):
+        """
+        Read the property behind a handle from point(). Returns None on errors,
+        like bacnet_read.
+        """
+        try:
             property_value = await self.app.read_property(
-                address_obj, object_id_obj, property_identifier
+                point.address_obj,
+                point.object_id,
+                point.property_id,
+                point.array_index,
             )
 
             if isinstance(property_value, AnyAtomic):
@@ -205,14 +349,14 @@ class EasyASO(ABC):
             return None
         except TypeError as e:
             print(
-                f"ERROR: Type error while reading property: {e} - Address: {address}, "
-                f"Object ID: {object_identifier}, Property Identifier: {property_identifier}"
+                f"ERROR: Type error while reading property: {e} - Address: {point.address}, "
+                f"Object ID: {point.object_identifier}, Property Identifier: {point.property_identifier}"
             )
             return None
         except Exception as e:
             print(
-                f"ERROR: Unexpected error while reading property: {e} - Address: {address}, "
-                f"Object ID: {object_identifier}, Property Identifier: {property_identifier}"
+                f"ERROR: Unexpected error while reading property: {e} - Address: {point.address}, "
+                f"Object ID: {point.object_identifier}, Property Identifier: {point.property_identifier}"
             )
             return None
 
@@ -230,33 +374,48 @@ class EasyASO(ABC):
         If value is 'null', it triggers a release using Null().
         """
         try:
-            address_obj = self._convert_to_address(address)
-            object_id_obj = self._convert_to_object_identifier(object_identifier)
-
-            # Parse property identifier and index
-            property_identifier, property_array_index = self.parse_property_identifier(
-                property_identifier
+            handle = self.point(address, object_identifier, property_identifier)
+        except Exception as e:
+            print(
+                f"ERROR: Unexpected error while writing property: {e} ",
+                f"Value attempted: {value}",
             )
+            return
+        await self.write_point(handle, value, priority)
 
-            # Handle 'null' values for release
+    async def write_point(self, point: PointHandle, value: any, priority: int = -1):
+        """
+        Write the property behind a handle from point(); 'null' releases, as in
+        bacnet_write.
+        """
+        try:
+            # Handle 'null' values for release; keep value as given for the registry
+            payload = value
             if value == "null":
                 if priority is None:
                     raise ValueError(
                         "null can only be used for overrides with a priority"
                     )
-                value = Null(())
+                payload = Null(())
 
             # Write the property value
             response = await self.app.write_property(
-                address_obj,
-                object_id_obj,
-                property_identifier,
+                point.address_obj,
+                point.object_id,
+                point.property_id,
+                payload,
+                point.array_index,
+                priority,
+            )
+            self.overrides.record(
+                point.address,
+                point.object_identifier,
                 value,
-                property_array_index,
                 priority,
+                point.property_identifier,
             )
             print(
-                f"INFO: {address} Write successful, ",
+                f"INFO: {point.address} Write successful, ",
                 f"Value: {value}, ",
                 f"Priority: {priority}, ",
                 f"Response: {response}",
@@ -275,6 +434,108 @@ class EasyASO(ABC):
                 f"Value attempted: {value}",
             )
 
+    # Devices written at once by write_many / release_many
+    write_pool_size = 16
+
+    async def write_many(self, writes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Write many points, up to write_pool_size devices at once. Each device
+        gets its writes in the order given, batched into WritePropertyMultiple
+        where the device supports it.
+
+        Writes are dicts with address, object_identifier, value and optionally
+        priority (-1 or None: no priority) and property_identifier. Returns one
+        dict per write, in order, with status ("success" / "error") and detail;
+        errors are returned, not printed.
+        """
+        writes = [_write_priority(w) for w in writes]
+        results: List[Any] = [None] * len(writes)
+        by_device: Dict[str, List[int]] = {}
+        for i, w in enumerate(writes):
+            by_device.setdefault(str(w["address"]), []).append(i)
+        pool = asyncio.Semaphore(max(1, self.write_pool_size))
+
+        async def device(indexes: List[int]):
+            batch = [writes[i] for i in indexes]
+            async with pool:
+                try:
+                    done = await self._bacnet_writer().write_many(batch)
+                except (Exception, ErrorRejectAbortNack) as e:
+                    done = [write_result(w, str(e)) for w in batch]
+            for i, result in zip(indexes, done):
+                results[i] = result
+            self._record_writes(batch, done)
+
+        await asyncio.gather(*(device(indexes) for indexes in by_device.values()))
+        return results
+
+    def _record_writes(self, writes: List[Dict[str, Any]], results: List[Dict[str, Any]]):
+        for w, result in zip(writes, results):
+            if result.get("status") == "success":
+                self.overrides.record(
+                    w["address"],
+                    w["object_identifier"],
+                    w["value"],
+                    w.get("priority"),
+                    w.get("property_identifier", "present-value"),
+                )
+
+    async def release_overrides(
+        self, deadline_s: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Release every override in self.overrides with write_many, all devices
+        at once, within deadline_s (release_deadline_s by default, from
+        EASY_ASO_RELEASE_DEADLINE_S). Runs on stop after on_stop. Returns the
+        overrides still in place; they are printed and stay in the registry
+        (and its file) to be released on the next start.
+        """
+        writes = self.overrides.release_writes()
+        if not writes:
+            return []
+        deadline = self.release_deadline_s if deadline_s is None else deadline_s
+        try:
+            await asyncio.wait_for(self.write_many(writes), deadline)
+        except asyncio.TimeoutError:
+            print(f"ERROR: Releasing overrides did not finish within {deadline} s.")
+        left = self.overrides.entries()
+        for entry in left:
+            print(
+                f"ERROR: Override not released: {entry['address']} {entry['object_identifier']} "
+                f"{entry['property_identifier']} at priority {entry['priority']}"
+            )
+        return left
+
+    async def release_many(self, points, priority: int) -> List[Dict[str, Any]]:
+        """
+        Release overrides ('null' at priority) on many points with write_many.
+        Points are handles from point() or (address, object_identifier[,
+        property_identifier]) tuples.
+        """
+        writes = []
+        for p in points:
+            address, object_identifier, property_identifier = point_key(p)
+            writes.append(
+                {
+                    "address": address,
+                    "object_identifier": object_identifier,
+                    "property_identifier": property_identifier,
+                    "value": "null",
+                    "priority": priority,
+                }
+            )
+        return await self.write_many(writes)
+
+    def _bacnet_writer(self) -> BacpypesClient:
+        # shares self.app; remembers which devices reject WritePropertyMultiple
+        app = getattr(self, "app", None)
+        writer = getattr(self, "_writer", None)
+        if writer is None or writer.app is not app:
+            if app is None:
+                raise RuntimeError("No BACnet application; create_application() must run first")
+            writer = self._writer = BacpypesClient(args=self.args, app=app)
+        return writer
+
     async def bacnet_rpm(
         self,
         address: Address,
@@ -297,16 +558,8 @@ class EasyASO(ABC):
         print(f"Received arguments for RPM: {args}")
         args_list: List[str] = list(args)
 
-        # Convert address string to BACnet Address object
-        address_obj = self._convert_to_address(address)
-
-        # Get device info from cache
-        device_info = await self.app.device_info_cache.get_device_info(address_obj)
-
-        # Look up vendor information
-        vendor_info = get_vendor_info(
-            device_info.vendor_identifier if device_info else 0
-        )
+        # BACnet Address and vendor information, looked up once per device
+        address_obj, vendor_info = await self.points.vendor_info(self.app, address)
 
         parameter_list = []
         while args_list:
@@ -375,6 +628,40 @@ class EasyASO(ABC):
             print(f"ERROR: during RPM: {err}")
             return [{"error": f"Error during RPM: {err}"}]
 
+        result_list = self._rpm_rows(response)
+        print("INFO: result_list ", result_list)
+
+        return result_list
+
+    async def rpm_points(self, points: Iterable[PointHandle]) -> List[Dict[str, Any]]:
+        """
+        One ReadPropertyMultiple for handles from point() on the same device.
+        The handles are resolved against the device's vendor once; after that no
+        identifiers are parsed or looked up. Rows are as from bacnet_rpm.
+        """
+        points = list(points)
+        if not points:
+            return [{"error": "Object identifier expected."}]
+        addresses = {p.address for p in points}
+        if len(addresses) > 1:
+            return [{"error": f"rpm_points needs points on one device, got {sorted(addresses)}"}]
+        try:
+            for p in points:
+                await self.points.resolve(self.app, p)
+        except ValueError as err:
+            print(f"ERROR: {err}")
+            return [{"error": str(err)}]
+
+        try:
+            response = await self.app.read_property_multiple(
+                points[0].address_obj, rpm_parameters(points)
+            )
+        except ErrorRejectAbortNack as err:
+            print(f"ERROR: during RPM: {err}")
+            return [{"error": f"Error during RPM: {err}"}]
+        return self._rpm_rows(response)
+
+    def _rpm_rows(self, response) -> List[Dict[str, Any]]:
         # Prepare the response with either property values or error messages
         result_list = []
         for (
@@ -396,7 +683,4 @@ class EasyASO(ABC):
                 result["value"] = property_value
 
             result_list.append(result)
-
-        print("INFO: result_list ", result_list)
-
         return result_list
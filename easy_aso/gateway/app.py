@@ -1,13 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import shlex
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel, Field
 
+from easy_aso.bacnet_client.base import DEFAULT_CONCURRENCY
 from easy_aso.bacnet_client.bacpypes_client import BacpypesClient
+from easy_aso.bacnet_client.remote_client import (
+    MAX_CONCURRENCY,
+    MAX_READS_PER_CALL,
+    MAX_RPMS_PER_CALL,
+    MAX_WRITES_PER_CALL,
+)
+from easy_aso.gateway.queues import DEFAULT_MAX_OUTSTANDING, QueuedBacnetClient
+
+T = TypeVar("T")
+
+# callers may shorten or lengthen this per request with the X-Request-Timeout header (seconds)
+DEFAULT_DEADLINE_S = float(os.environ.get("BACNET_GATEWAY_DEADLINE_S", "30"))
 
 
 class ReadRequest(BaseModel):
@@ -24,14 +38,28 @@ class WriteRequest(BaseModel):
     property_identifier: str = "present-value"
 
 
+class WriteManyRequest(BaseModel):
+    writes: List[WriteRequest] = Field(..., min_length=1, max_length=MAX_WRITES_PER_CALL)
+
+
 class RPMRequest(BaseModel):
     address: str
     args: List[str]
 
 
+class ReadManyRequest(BaseModel):
+    reads: List[ReadRequest] = Field(..., min_length=1, max_length=MAX_READS_PER_CALL)
+    concurrency: int = Field(default=DEFAULT_CONCURRENCY, ge=1, le=MAX_CONCURRENCY, description="BACnet requests in flight at once")
+
+
+class RPMManyRequest(BaseModel):
+    requests: List[RPMRequest] = Field(..., min_length=1, max_length=MAX_RPMS_PER_CALL)
+    concurrency: int = Field(default=DEFAULT_CONCURRENCY, ge=1, le=MAX_CONCURRENCY, description="BACnet requests in flight at once")
+
+
 app = FastAPI(title="easy-aso bacnet-gateway", version="0.2.0")
 
-_client: BacpypesClient | None = None
+_client: QueuedBacnetClient | None = None
 
 
 def _argv_from_env() -> List[str]:
@@ -48,7 +76,8 @@ def _argv_from_env() -> List[str]:
 async def _startup() -> None:
     global _client
     argv = _argv_from_env()
-    _client = BacpypesClient(argv=argv)
+    max_outstanding = int(os.environ.get("BACNET_GATEWAY_MAX_OUTSTANDING", str(DEFAULT_MAX_OUTSTANDING)))
+    _client = QueuedBacnetClient(BacpypesClient(argv=argv), max_outstanding)
     await _client.start()
 
 
@@ -60,39 +89,152 @@ async def _shutdown() -> None:
         _client = None
 
 
+def _deadline(request: Request) -> float:
+    raw = request.headers.get("x-request-timeout")
+    try:
+        timeout = float(raw) if raw else DEFAULT_DEADLINE_S
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"X-Request-Timeout must be seconds, got {raw!r}")
+    return timeout if timeout > 0 else DEFAULT_DEADLINE_S
+
+
+async def _disconnected(request: Request) -> None:
+    # the body is already read, so the next message is the disconnect
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _bounded(request: Request, work: Awaitable[T]) -> T:
+    """Await ``work`` until its deadline (504) or until the caller hangs up.
+
+    Either way the work is cancelled, which takes it out of its device queue
+    if it has not reached the device yet.
+    """
+    timeout = _deadline(request)
+    task = asyncio.ensure_future(work)
+    gone = asyncio.ensure_future(_disconnected(request))
+    done: set = set()
+    try:
+        done, _ = await asyncio.wait({task, gone}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        gone.cancel()
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    if task not in done:
+        if gone in done:
+            # 499: nobody is listening, but the access log should say why
+            raise HTTPException(status_code=499, detail="client disconnected")
+        raise HTTPException(status_code=504, detail="deadline passed before the device answered")
+    return task.result()
+
+
 @app.get("/health")
 async def health() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/queues")
+async def queues() -> Dict[str, Any]:
+    """Requests outstanding and queued per device, and reads merged so far."""
+    if _client is None:
+        raise HTTPException(status_code=503, detail="gateway not ready")
+    return {
+        "max_outstanding": _client.max_outstanding,
+        "devices": _client.status(),
+        "merged_reads": _client.merged_reads,
+    }
+
+
 @app.post("/read")
-async def read(req: ReadRequest) -> Dict[str, Any]:
+async def read(req: ReadRequest, request: Request) -> Dict[str, Any]:
     if _client is None:
         raise HTTPException(status_code=503, detail="gateway not ready")
     try:
-        value = await _client.read(req.address, req.object_identifier, req.property_identifier)
+        value = await _bounded(request, _client.read(req.address, req.object_identifier, req.property_identifier))
         return {"value": value}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=502, detail=str(e))
 
 
 @app.post("/write")
-async def write(req: WriteRequest) -> Dict[str, str]:
+async def write(req: WriteRequest, request: Request) -> Dict[str, str]:
     if _client is None:
         raise HTTPException(status_code=503, detail="gateway not ready")
     try:
-        await _client.write(req.address, req.object_identifier, req.value, req.priority, req.property_identifier)
+        await _bounded(
+            request,
+            _client.write(req.address, req.object_identifier, req.value, req.priority, req.property_identifier),
+        )
         return {"status": "ok"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=502, detail=str(e))
 
 
+@app.post("/write_many")
+async def write_many(req: WriteManyRequest, request: Request) -> Dict[str, Any]:
+    if _client is None:
+        raise HTTPException(status_code=503, detail="gateway not ready")
+    try:
+        results = await _bounded(request, _client.write_many([w.model_dump() for w in req.writes]))
+        return {"results": results}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+@app.post("/read_many")
+async def read_many(req: ReadManyRequest, request: Request) -> Dict[str, Any]:
+    """Read many points across devices; per-read status, value and detail, in request order."""
+    if _client is None:
+        raise HTTPException(status_code=503, detail="gateway not ready")
+    results = await _bounded(request, _client.read_many([r.model_dump() for r in req.reads], req.concurrency))
+    return {"results": results}
+
+
+@app.post("/rpm_many")
+async def rpm_many(req: RPMManyRequest, request: Request) -> Dict[str, Any]:
+    """One RPM per request across devices; per-request status, rows and detail, in request order."""
+    if _client is None:
+        raise HTTPException(status_code=503, detail="gateway not ready")
+    results = await _bounded(request, _client.rpm_many([r.model_dump() for r in req.requests], req.concurrency))
+    return {"results": results}
+
+
 @app.post("/rpm")
-async def rpm(req: RPMRequest) -> Dict[str, Any]:
+async def rpm(req: RPMRequest, request: Request) -> Dict[str, Any]:
     if _client is None:
         raise HTTPException(status_code=503, detail="gateway not ready")
     try:
-        results = await _client.rpm(req.address, *req.args)
+        results = await _bounded(request, _client.rpm(req.address, *req.args))
         return {"results": results}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=502, detail=str(e))
+
+
+def main() -> None:
+    """Serve the gateway with uvicorn (``python -m easy_aso.gateway.app``).
+
+    Listens on ``BACNET_GATEWAY_HOST``:``BACNET_GATEWAY_PORT`` (default
+    ``127.0.0.1:8000``), or only on the Unix socket ``BACNET_GATEWAY_UNIX_SOCKET``
+    when that is set, for agents on the same host (``unix://`` gateway URL).
+    """
+    import uvicorn
+
+    uds = (os.environ.get("BACNET_GATEWAY_UNIX_SOCKET") or "").strip()
+    if uds:
+        uvicorn.run(app, uds=uds)
+    else:
+        host = os.environ.get("BACNET_GATEWAY_HOST", "127.0.0.1")
+        uvicorn.run(app, host=host, port=int(os.environ.get("BACNET_GATEWAY_PORT", "8000")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from easy_aso.bacnet_client.base import BacnetClient
+
+T = TypeVar("T")
+
+# BACnet requests the gateway keeps outstanding to one device at a time
+DEFAULT_MAX_OUTSTANDING = 2
+
+
+class _SharedRead:
+    """One read in flight and the number of callers waiting for it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class QueuedBacnetClient(BacnetClient):
+    """Wrap a client so each device sees at most ``max_outstanding`` requests.
+
+    Small controllers accept only a few concurrent transactions; past that they
+    abort, the stack retries, and every caller waits longer. Requests for one
+    address queue here (first come, first served) instead of going straight to
+    the wire. Requests for other addresses are not held up.
+
+    A read whose address, object and property match a read already queued or in
+    flight joins it instead of sending another request. The shared read is
+    cancelled only when every caller waiting for it has gone.
+
+    ``write_many`` holds one slot per device for that device's writes, since
+    the inner client sends them as WritePropertyMultiple requests in turn.
+    Cancelling a call that is still queued removes it from the queue.
+    """
+
+    def __init__(self, inner: BacnetClient, max_outstanding: int = DEFAULT_MAX_OUTSTANDING):
+        self.inner = inner
+        self.max_outstanding = max(1, max_outstanding)
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._queued: Dict[str, int] = {}
+        self._outstanding: Dict[str, int] = {}
+        self._reads: Dict[Tuple[str, str, str], _SharedRead] = {}
+        self.merged_reads = 0
+
+    async def start(self) -> None:
+        await self.inner.start()
+
+    async def stop(self) -> None:
+        await self.inner.stop()
+
+    async def _queued_call(self, address: str, func: Callable[..., Awaitable[T]], *args: Any) -> T:
+        address = str(address)
+        slots = self._slots.get(address)
+        if slots is None:
+            slots = self._slots[address] = asyncio.Semaphore(self.max_outstanding)
+        self._queued[address] = self._queued.get(address, 0) + 1
+        try:
+            await slots.acquire()
+        except BaseException:
+            self._queued[address] -= 1
+            self._forget(address)
+            raise
+        self._queued[address] -= 1
+        self._outstanding[address] = self._outstanding.get(address, 0) + 1
+        try:
+            return await func(*args)
+        finally:
+            self._outstanding[address] -= 1
+            slots.release()
+            self._forget(address)
+
+    def _forget(self, address: str) -> None:
+        """Drop an idle device's entries, so addresses seen once do not pile up."""
+        if self._queued.get(address) or self._outstanding.get(address):
+            return
+        self._slots.pop(address, None)
+        self._queued.pop(address, None)
+        self._outstanding.pop(address, None)
+
+    async def read(self, address: str, object_identifier: str, property_identifier: str = "present-value") -> Any:
+        key = (str(address), object_identifier, property_identifier)
+        shared = self._reads.get(key)
+        if shared is None:
+            task = asyncio.ensure_future(
+                self._queued_call(address, self.inner.read, address, object_identifier, property_identifier)
+            )
+            shared = self._reads[key] = _SharedRead(task)
+
+            def forget(_: asyncio.Task, shared: _SharedRead = shared) -> None:
+                if self._reads.get(key) is shared:
+                    del self._reads[key]
+
+            task.add_done_callback(forget)
+        else:
+            self.merged_reads += 1
+        shared.waiters += 1
+        try:
+            # shield: one caller going away must not cancel the others' read
+            return await asyncio.shield(shared.task)
+        finally:
+            shared.waiters -= 1
+            if shared.waiters == 0 and not shared.task.done():
+                shared.task.cancel()
+
+    async def write(
+        self,
+        address: str,
+        object_identifier: str,
+        value: Any,
+        priority: Optional[int] = None,
+        property_identifier: str = "present-value",
+    ) -> None:
+        await self._queued_call(
+            address, self.inner.write, address, object_identifier, value, priority, property_identifier
+        )
+
+    async def rpm(self, address: str, *args: str) -> List[Dict[str, Any]]:
+        return await self._queued_call(address, self.inner.rpm, address, *args)
+
+    async def write_many(self, writes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(writes)
+        groups: Dict[str, List[int]] = {}
+        for i, w in enumerate(writes):
+            groups.setdefault(str(w["address"]), []).append(i)
+
+        async def device(address: str, indexes: List[int]) -> None:
+            done = await self._queued_call(address, self.inner.write_many, [writes[i] for i in indexes])
+            for i, result in zip(indexes, done):
+                results[i] = result
+
+        await asyncio.gather(*(device(a, idx) for a, idx in groups.items()))
+        return results  # type: ignore[return-value]
+
+    def status(self) -> Dict[str, Dict[str, int]]:
+        """Outstanding and queued request counts per device address that has any."""
+        out: Dict[str, Dict[str, int]] = {}
+        for address in self._slots:
+            outstanding = self._outstanding.get(address, 0)
+            queued = self._queued.get(address, 0)
+            if outstanding or queued:
+                out[address] = {"outstanding": outstanding, "queued": queued}
+        return out
@@ -0,0 +1,108 @@
+"""Registry of the overrides an agent holds, so they can be released on stop.
+
+Every successful write with a priority and a non-null value adds an entry;
+a successful ``null`` write at the same priority removes it. With a path the
+registry is kept in a JSON file, rewritten whenever an override is added or
+removed (not when only the value changes), so an agent that was killed before
+releasing can release the leftovers on its next start.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OverrideKey = Tuple[str, str, str, int]
+
+
+def _key(entry: Dict[str, Any]) -> OverrideKey:
+    return (
+        str(entry["address"]),
+        entry["object_identifier"],
+        entry.get("property_identifier", "present-value"),
+        int(entry["priority"]),
+    )
+
+
+class OverrideRegistry:
+    """Points this agent overrode, one entry per (address, object, property, priority)."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or None
+        self._entries: Dict[OverrideKey, Dict[str, Any]] = {}
+        if self.path and os.path.exists(self.path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(
+        self,
+        address: str,
+        object_identifier: str,
+        value: Any,
+        priority: Optional[int],
+        property_identifier: str = "present-value",
+    ) -> None:
+        """Note a successful write; writes without a priority are not overrides."""
+        if priority is None or int(priority) < 0:
+            return
+        entry = {
+            "address": str(address),
+            "object_identifier": object_identifier,
+            "property_identifier": property_identifier,
+            "priority": int(priority),
+        }
+        key = _key(entry)
+        if value == "null" or value is None:
+            if self._entries.pop(key, None) is not None:
+                self.save()
+            return
+        if key in self._entries:
+            return
+        entry["since"] = time.time()
+        self._entries[key] = entry
+        self.save()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        return [dict(entry) for entry in self._entries.values()]
+
+    def release_writes(self) -> List[Dict[str, Any]]:
+        """One ``null`` write per override, for ``write_many``."""
+        return [
+            {
+                "address": entry["address"],
+                "object_identifier": entry["object_identifier"],
+                "property_identifier": entry["property_identifier"],
+                "value": "null",
+                "priority": entry["priority"],
+            }
+            for entry in self._entries.values()
+        ]
+
+    def load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            entries = {_key(entry): entry for entry in data.get("overrides", [])}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable override registry %s: %s", self.path, e)
+            return
+        self._entries = entries
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "overrides": list(self._entries.values())}, f, indent=1)
+            # replace in one step so a kill mid-write leaves the old file intact
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Could not save override registry %s: %s", self.path, e)
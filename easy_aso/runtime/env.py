@@ -4,26 +4,44 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
+
+from easy_aso.bacnet_client.jsonrpc_client import TRANSPORTS
+from easy_aso.bacnet_client.multi_gateway import GatewayRoute, parse_gateway_routes
 
 
 @dataclass(frozen=True)
 class BacnetRpcConfig:
-    """Outbound BACnet-over-JSON-RPC settings."""
+    """Outbound BACnet-over-JSON-RPC settings.
+
+    When ``gateways`` is non-empty, requests are routed over those gateways
+    (see :class:`~easy_aso.bacnet_client.multi_gateway.MultiGatewayBacnetClient`)
+    and ``base_url`` is not used. ``transport="ws"`` sends the calls over one
+    WebSocket channel per gateway instead of one HTTP request each.
+    """
 
     base_url: str
     entrypoint: str
     bearer_token: Optional[str] = None
     timeout_s: float = 15.0
+    gateways: Tuple[GatewayRoute, ...] = ()
+    transport: str = "http"
 
 
 def load_rpc_config_from_env() -> BacnetRpcConfig:
     """
     Read the same environment variables used by the supervisor and demo stacks.
 
-    - ``SUPERVISOR_BACNET_RPC_URL`` (default ``http://127.0.0.1:8080``)
+    - ``SUPERVISOR_BACNET_RPC_URL`` (default ``http://127.0.0.1:8080``); a
+      ``unix:///path/to/rpc.sock`` URL talks to a gateway on the same host over
+      its Unix socket
     - ``SUPERVISOR_BACNET_RPC_ENTRYPOINT`` (default ``/api``)
     - ``BACNET_RPC_API_KEY`` optional Bearer token
+    - ``SUPERVISOR_BACNET_RPC_GATEWAYS`` optional gateway set, e.g.
+      ``"http://gw-a:8080=1000-1999 http://gw-b:8080=1000-1999 http://gw-c:8080"``
+      (see :func:`~easy_aso.bacnet_client.multi_gateway.parse_gateway_routes`)
+    - ``SUPERVISOR_BACNET_RPC_TRANSPORT`` ``http`` (default) or ``ws`` for the
+      WebSocket channel (needs ``easy-aso[channel]``)
     """
     base = os.environ.get("SUPERVISOR_BACNET_RPC_URL", "http://127.0.0.1:8080").rstrip("/")
     entry = os.environ.get("SUPERVISOR_BACNET_RPC_ENTRYPOINT", "/api").strip()
@@ -31,4 +49,10 @@ def load_rpc_config_from_env() -> BacnetRpcConfig:
         entry = "/" + entry
     raw = (os.environ.get("BACNET_RPC_API_KEY") or "").strip()
     tok = raw or None
-    return BacnetRpcConfig(base_url=base, entrypoint=entry, bearer_token=tok)
+    gateways = parse_gateway_routes(os.environ.get("SUPERVISOR_BACNET_RPC_GATEWAYS", ""))
+    transport = (os.environ.get("SUPERVISOR_BACNET_RPC_TRANSPORT") or "http").strip().lower()
+    if transport not in TRANSPORTS:
+        raise ValueError(f"SUPERVISOR_BACNET_RPC_TRANSPORT must be one of {', '.join(TRANSPORTS)}, not {transport!r}")
+    return BacnetRpcConfig(
+        base_url=base, entrypoint=entry, bearer_token=tok, gateways=gateways, transport=transport
+    )
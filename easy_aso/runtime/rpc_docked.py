@@ -3,7 +3,10 @@
 instead of a local BACnet ``Application`` (no UDP ``47808`` bind in this process).
 
 Use this for **sidecar** or **multi-container** agents that share one BACnet gateway
-(e.g. diy-bacnet-server) over JSON-RPC.
+(e.g. diy-bacnet-server) over JSON-RPC. With ``BacnetRpcConfig.gateways`` set, a
+:class:`~easy_aso.bacnet_client.multi_gateway.MultiGatewayBacnetClient` spreads the
+calls over several gateways instead, and ``transport="ws"`` multiplexes them over
+one WebSocket channel.
 
 ``JsonRpcBacnetClient`` expects ``address`` to be a **device instance** string for
 diy-bacnet-server RPC (see that client's docstring).
@@ -11,12 +14,15 @@ diy-bacnet-server RPC (see that client's docstring).
 
 from __future__ import annotations
 
-from typing import Any, List, Optional
+from typing import Any, AsyncIterator, Iterable, List, Optional, Tuple
 
 from bacpypes3.pdu import Address
 
-from easy_aso.bacnet_client.jsonrpc_client import JsonRpcBacnetClient
-from easy_aso.easy_aso import EasyASO
+from easy_aso.bacnet_client.base import write_result
+from easy_aso.bacnet_client.jsonrpc_client import JsonRpcBacnetClient, make_jsonrpc_client
+from easy_aso.bacnet_client.multi_gateway import MultiGatewayBacnetClient
+from easy_aso.bacnet_client.points import PointHandle
+from easy_aso.easy_aso import EasyASO, _write_priority
 
 from .env import BacnetRpcConfig, load_rpc_config_from_env
 
@@ -42,21 +48,46 @@ class RpcDockedEasyASO(EasyASO):
             self._rpc = None
 
         cfg = self._rpc_config or load_rpc_config_from_env()
-        self._rpc = JsonRpcBacnetClient(
-            cfg.base_url,
-            timeout_s=cfg.timeout_s,
-            entrypoint=cfg.entrypoint,
-            bearer_token=cfg.bearer_token,
-        )
+        if cfg.gateways:
+            self._rpc = MultiGatewayBacnetClient(
+                cfg.gateways,
+                timeout_s=cfg.timeout_s,
+                entrypoint=cfg.entrypoint,
+                bearer_token=cfg.bearer_token,
+                transport=cfg.transport,
+            )
+        elif cfg.transport != "http":
+            self._rpc = make_jsonrpc_client(
+                cfg.base_url,
+                cfg.transport,
+                timeout_s=cfg.timeout_s,
+                entrypoint=cfg.entrypoint,
+                bearer_token=cfg.bearer_token,
+            )
+        else:
+            self._rpc = JsonRpcBacnetClient(
+                cfg.base_url,
+                timeout_s=cfg.timeout_s,
+                entrypoint=cfg.entrypoint,
+                bearer_token=cfg.bearer_token,
+            )
         self.app = None
         print("INFO: RpcDockedEasyASO JSON-RPC client ready (no local BACnet Application).")
 
     async def close_rpc_dock(self) -> None:
         rpc = getattr(self, "_rpc", None)
         if rpc is not None:
+            # the client is about to go; release the overrides while it can
+            await self.release_overrides()
             await rpc.close()
             self._rpc = None
 
+    async def release_overrides(self, deadline_s: Optional[float] = None) -> List[dict[str, Any]]:
+        if getattr(self, "_rpc", None) is None:
+            # closed: close_rpc_dock already released what it could
+            return self.overrides.entries()
+        return await super().release_overrides(deadline_s)
+
     async def bacnet_read(
         self,
         address: str,
@@ -88,12 +119,17 @@ class RpcDockedEasyASO(EasyASO):
                 priority=pri,
                 property_identifier=property_identifier,
             )
+            self.overrides.record(address, object_identifier, value, pri, property_identifier)
         except Exception as e:
             print(f"ERROR: RPC write failed: {e} — address={address!r} object={object_identifier!r}")
 
     async def bacnet_rpm(self, address: Address, *args: str):
         """
         Delegate to ``JsonRpcBacnetClient.rpm`` using ``str(address)`` as the device key.
+
+        Rows are JSON-native, as encoded by diy-bacnet-server: ``object_identifier``
+        and ``property_identifier`` are strings (``"analog-value,1"``, ``"present-value"``)
+        and failed properties carry ``"Error: <class>, <code>"`` as the value.
         """
         try:
             addr = str(address)
@@ -102,3 +138,57 @@ class RpcDockedEasyASO(EasyASO):
         except Exception as e:
             print(f"ERROR: RPC RPM failed: {e} — address={address!r} args={args!r}")
             return [{"error": str(e)}]
+
+    async def write_many(self, writes: List[dict[str, Any]]) -> List[dict[str, Any]]:
+        """
+        One ``write_many`` call; the gateway batches each device's writes into
+        WritePropertyMultiple where it can, and writes to one point stay in
+        order. A failed call fails every write in it.
+        """
+        writes = [_write_priority(w) for w in writes]
+        if not writes:
+            return []
+        try:
+            results = await self._rpc.write_many(writes)
+        except Exception as e:
+            print(f"ERROR: RPC write_many failed: {e} — {len(writes)} writes")
+            return [write_result(w, str(e)) for w in writes]
+        self._record_writes(writes, results)
+        return results
+
+    async def read_point(self, point: PointHandle):
+        return await self.bacnet_read(point.address, point.object_identifier, point.property_identifier)
+
+    async def write_point(self, point: PointHandle, value: Any, priority: int = -1):
+        await self.bacnet_write(point.address, point.object_identifier, value, priority, point.property_identifier)
+
+    async def rpm_points(self, points: Iterable[PointHandle]) -> List[dict[str, Any]]:
+        """
+        One ``rpm`` call for handles on the same device. The gateway parses the
+        identifiers, so handles only save the string work on this side.
+        """
+        points = list(points)
+        addresses = {p.address for p in points}
+        if len(addresses) != 1:
+            return [{"error": f"rpm_points needs points on one device, got {sorted(addresses)}"}]
+        args: List[str] = []
+        for p in points:
+            if p.array_index is not None:
+                # RPM argument lists cannot carry an array index
+                return [{"error": f"rpm_points cannot read {p.property_identifier} over RPC"}]
+            # the client takes (object, property) pairs, one per property
+            args += [p.object_identifier, p.property_id]
+        return await self.bacnet_rpm(points[0].address, *args)
+
+    def bacnet_subscribe_cov(
+        self, targets: Iterable[Tuple[str, str]]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Event-driven alternative to polling: ``async for event in
+        self.bacnet_subscribe_cov([("201201", "analog-input,2")])``.
+
+        See ``JsonRpcBacnetClient.subscribe_cov`` for the event shape. Connection
+        errors are raised to the caller, which decides whether to reconnect or
+        fall back to polling.
+        """
+        return self._rpc.subscribe_cov(targets)
@@ -0,0 +1,142 @@
+"""Point subscriptions and the snapshot ``EasyASO`` refreshes before each step.
+
+An agent declares the points it uses with ``subscribe_points`` (usually in
+``on_start``). Before every ``on_step`` the framework polls the points that are
+due, one ReadPropertyMultiple per device, and replaces ``self.snapshot`` with a
+new :class:`PointSnapshot`. Code inside ``on_step`` reads that snapshot, so all
+values it sees come from the same refresh.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from easy_aso.bacnet_client.points import PointHandle
+
+GOOD = "good"  # read in the latest poll of the point
+STALE = "stale"  # the latest poll failed, or the value is older than stale_after intervals
+BAD = "bad"  # no value yet: never read, or every poll so far failed
+
+# a GOOD value not refreshed for this many intervals turns STALE
+STALE_AFTER_INTERVALS = 3.0
+
+PointKey = Tuple[str, str, str]
+
+
+def point_key(point: Union[PointHandle, Sequence[str]]) -> PointKey:
+    """``(address, object_identifier, property_identifier)`` for a handle or a 2/3-tuple."""
+    if isinstance(point, PointHandle):
+        return (point.address, point.object_identifier, point.property_identifier)
+    if len(point) == 2:
+        return (str(point[0]), point[1], "present-value")
+    address, object_identifier, property_identifier = point
+    return (str(address), object_identifier, property_identifier)
+
+
+@dataclass(frozen=True)
+class PointValue:
+    """One point in a snapshot. ``timestamp`` is ``time.time()`` of the read that gave ``value``."""
+
+    value: Any
+    timestamp: Optional[float]
+    quality: str
+    detail: Optional[str] = None
+
+    @property
+    def good(self) -> bool:
+        return self.quality == GOOD
+
+
+_NEVER_READ = PointValue(None, None, BAD, "not read yet")
+
+
+class PointSnapshot(Mapping[PointKey, PointValue]):
+    """Read-only view of every subscribed point as of ``taken_at``.
+
+    Index it with a :class:`PointHandle` or an ``(address, object[, property])``
+    tuple. ``value()`` returns the value, or ``default`` when the point is BAD.
+    """
+
+    def __init__(self, values: Optional[Dict[PointKey, PointValue]] = None, taken_at: Optional[float] = None):
+        self._values = values or {}
+        self.taken_at = taken_at
+
+    def __getitem__(self, point) -> PointValue:
+        return self._values[point_key(point)]
+
+    def __contains__(self, point) -> bool:
+        try:
+            return point_key(point) in self._values
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self) -> Iterator[PointKey]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def value(self, point, default: Any = None) -> Any:
+        entry = self._values.get(point_key(point))
+        if entry is None or entry.quality == BAD:
+            return default
+        return entry.value
+
+
+@dataclass
+class Subscription:
+    point: PointHandle
+    interval_s: float
+    next_due: float = 0.0
+
+
+def rpm_row_values(points: List[PointHandle], rows: List[Dict[str, Any]]) -> List[Tuple[Any, Optional[str]]]:
+    """``(value, error)`` per point from the rows of one RPM over ``points``.
+
+    Rows come back in request order. A single ``{"error"}`` row fails the whole
+    request; a value of ``"Error: <class>, <code>"`` fails one property.
+    """
+    if len(rows) == 1 and set(rows[0]) == {"error"}:
+        return [(None, str(rows[0]["error"]))] * len(points)
+    if len(rows) != len(points):
+        detail = f"RPM answered {len(rows)} properties for {len(points)} requested"
+        return [(None, detail)] * len(points)
+    out: List[Tuple[Any, Optional[str]]] = []
+    for row in rows:
+        value = row.get("value")
+        if isinstance(value, str) and value.startswith("Error: "):
+            out.append((None, value))
+        else:
+            out.append((value, None))
+    return out
+
+
+def next_snapshot(
+    previous: PointSnapshot,
+    subscriptions: Mapping[PointKey, Subscription],
+    polled: Mapping[PointKey, Tuple[Any, Optional[str], float]],
+    now: float,
+    stale_after: float = STALE_AFTER_INTERVALS,
+) -> PointSnapshot:
+    """Snapshot with ``polled`` ``(value, error, read_at)`` applied on top of ``previous``.
+
+    Points that were not polled keep their entry, turning STALE once it is more
+    than ``stale_after`` intervals old.
+    """
+    values: Dict[PointKey, PointValue] = {}
+    for key, sub in subscriptions.items():
+        old = previous._values.get(key, _NEVER_READ)
+        if key in polled:
+            value, error, read_at = polled[key]
+            if error is None:
+                values[key] = PointValue(value, read_at, GOOD)
+            elif old.timestamp is None:
+                values[key] = PointValue(None, None, BAD, error)
+            else:
+                values[key] = PointValue(old.value, old.timestamp, STALE, error)
+        elif old.quality == GOOD and now - old.timestamp > stale_after * sub.interval_s:
+            values[key] = PointValue(old.value, old.timestamp, STALE, "not refreshed in time")
+        else:
+            values[key] = old
+    return PointSnapshot(values, now)
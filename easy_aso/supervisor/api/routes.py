@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Any, List
+import json
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
 
 from easy_aso.supervisor.api import schemas
 from easy_aso.supervisor.coordinator import SupervisorCoordinator
@@ -192,3 +193,26 @@ async def point_latest(request: Request, point_id: str) -> schemas.PointLatestOu
         last_polled_at=p.last_polled_at,
         last_error=p.last_error,
     )
+
+
+@router.get("/points/{point_id}/trend", response_model=List[schemas.TrendRecordOut])
+async def point_trend(
+    request: Request,
+    point_id: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = Query(default=1000, ge=1, le=100000),
+) -> List[schemas.TrendRecordOut]:
+    """Trend-log history ingested with ReadRange (``log-buffer`` points), oldest first."""
+    if await _coord(request).get_point(point_id) is None:
+        raise HTTPException(status_code=404, detail="point not found")
+    records = await _coord(request).list_trend_records(point_id, since=since, until=until, limit=limit)
+    return [
+        schemas.TrendRecordOut(
+            sequence=r.sequence,
+            recorded_at=r.recorded_at,
+            value=r.decoded_value(),
+            status_flags=json.loads(r.status_flags_json) if r.status_flags_json else None,
+        )
+        for r in records
+    ]
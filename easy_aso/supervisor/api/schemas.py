@@ -56,3 +56,10 @@ class PointLatestOut(BaseModel):
     last_value: Any = None
     last_polled_at: Optional[str] = None
     last_error: Optional[str] = None
+
+
+class TrendRecordOut(BaseModel):
+    sequence: int
+    recorded_at: str
+    value: Any = None
+    status_flags: Any = None
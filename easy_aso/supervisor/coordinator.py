@@ -4,7 +4,7 @@ import logging
 from typing import Any, List, Optional
 
 from easy_aso.supervisor.runtime.registry import SupervisorRuntime
-from easy_aso.supervisor.store.models import Device, Point
+from easy_aso.supervisor.store.models import Device, Point, TrendRecord
 from easy_aso.supervisor.store.repository import SupervisorRepository
 
 logger = logging.getLogger(__name__)
@@ -117,3 +117,13 @@ class SupervisorCoordinator:
 
     async def get_point(self, point_id: str) -> Optional[Point]:
         return await self._repo.get_point(point_id)
+
+    async def list_trend_records(
+        self,
+        point_id: str,
+        *,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 1000,
+    ) -> List[TrendRecord]:
+        return await self._repo.list_trend_records(point_id, since=since, until=until, limit=limit)
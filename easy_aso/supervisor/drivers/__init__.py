@@ -1,4 +1,4 @@
-from .base import BaseDriver, ReadBatchResult
+from .base import BaseDriver, ReadBatchResult, TrendReadResult
 from .factory import create_driver
 
-__all__ = ["BaseDriver", "ReadBatchResult", "create_driver"]
+__all__ = ["BaseDriver", "ReadBatchResult", "TrendReadResult", "create_driver"]
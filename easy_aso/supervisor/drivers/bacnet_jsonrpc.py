@@ -1,12 +1,27 @@
 from __future__ import annotations
 
 import os
-from typing import Any, ClassVar, List, Sequence, Tuple
+from typing import Any, ClassVar, Dict, List, Optional, Sequence, Tuple
 
-from easy_aso.bacnet_client.jsonrpc_client import JsonRpcBacnetClient
+from easy_aso.bacnet_client.jsonrpc_client import make_jsonrpc_client
+from easy_aso.bacnet_client.multi_gateway import MultiGatewayBacnetClient, parse_gateway_routes
 from easy_aso.supervisor.store.models import Device, Point
 
-from .base import BaseDriver, ReadBatchResult
+from .base import BaseDriver, ReadBatchResult, TrendReadResult
+
+
+# a driver is created per poll, so gateway pools are shared by the whole process:
+# their health and in-flight counts have to outlive any single device poll
+_gateway_pools: Dict[Tuple[str, str, str], MultiGatewayBacnetClient] = {}
+
+
+def _gateway_pool(spec: str, entrypoint: str, transport: str) -> MultiGatewayBacnetClient:
+    key = (spec, entrypoint, transport)
+    pool = _gateway_pools.get(key)
+    if pool is None:
+        pool = MultiGatewayBacnetClient(parse_gateway_routes(spec), entrypoint=entrypoint, transport=transport)
+        _gateway_pools[key] = pool
+    return pool
 
 
 def _norm_key(obj: str, prop: str) -> Tuple[str, str]:
@@ -14,18 +29,32 @@ def _norm_key(obj: str, prop: str) -> Tuple[str, str]:
 
 
 class BacnetJsonRpcDriver(BaseDriver):
-    """Poll BACnet devices through diy-bacnet-server JSON-RPC (RPM batching)."""
+    """Poll BACnet devices through diy-bacnet-server JSON-RPC (RPM batching, ReadRange).
+
+    A device with its own ``rpc_base_url`` uses that gateway. Otherwise, when
+    ``SUPERVISOR_BACNET_RPC_GATEWAYS`` is set, requests go through a shared
+    :class:`MultiGatewayBacnetClient`; else to ``SUPERVISOR_BACNET_RPC_URL``.
+    ``SUPERVISOR_BACNET_RPC_TRANSPORT=ws`` uses the WebSocket channel.
+    """
 
     DRIVER_TYPE: ClassVar[str] = "bacnet_jsonrpc"
 
     def __init__(self, device: Device) -> None:
         self._device = device
-        base = device.rpc_base_url or os.environ.get("SUPERVISOR_BACNET_RPC_URL", "http://127.0.0.1:8080")
         entry = device.rpc_entrypoint or os.environ.get("SUPERVISOR_BACNET_RPC_ENTRYPOINT", "/api")
-        self._client = JsonRpcBacnetClient(base, entrypoint=entry)
+        gateways = os.environ.get("SUPERVISOR_BACNET_RPC_GATEWAYS", "").strip()
+        transport = (os.environ.get("SUPERVISOR_BACNET_RPC_TRANSPORT") or "http").strip().lower()
+        self._owns_client = bool(device.rpc_base_url) or not gateways
+        self._client: Any
+        if self._owns_client:
+            base = device.rpc_base_url or os.environ.get("SUPERVISOR_BACNET_RPC_URL", "http://127.0.0.1:8080")
+            self._client = make_jsonrpc_client(base, transport, entrypoint=entry)
+        else:
+            self._client = _gateway_pool(gateways, entry, transport)
 
     async def close(self) -> None:
-        await self._client.close()
+        if self._owns_client:
+            await self._client.close()
 
     async def read_points(self, device: Device, points: Sequence[Point]) -> ReadBatchResult:
         if not points:
@@ -83,3 +112,34 @@ class BacnetJsonRpcDriver(BaseDriver):
             else:
                 out.errors[point_id] = "missing result for object/property in RPM response"
         return out
+
+    async def read_trend(
+        self,
+        device: Device,
+        point: Point,
+        after_sequence: Optional[int],
+        max_records: int,
+    ) -> TrendReadResult:
+        addr = device.device_address
+        obj = point.object_identifier
+        prop = point.property_identifier
+        if after_sequence is not None:
+            res = await self._client.read_range(
+                addr, obj, range_type="sequence", reference=after_sequence + 1, count=max_records, property_identifier=prop
+            )
+            if res.get("records") or res.get("more"):
+                return TrendReadResult(records=res["records"], more=bool(res.get("more")))
+            # nothing after the cursor: either no new records, or the log was
+            # cleared (sequence numbers restarted) / wrapped past the cursor
+            total = await self._client.read(addr, obj, "total-record-count")
+            if not isinstance(total, int) or total == after_sequence:
+                return TrendReadResult()
+
+        res = await self._client.read_range(
+            addr, obj, range_type="position", reference=1, count=max_records, property_identifier=prop
+        )
+        return TrendReadResult(
+            records=res.get("records", []),
+            more=bool(res.get("more")),
+            resynced=after_sequence is not None,
+        )
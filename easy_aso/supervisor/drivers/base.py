@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, ClassVar, Dict, Mapping, Sequence
+from typing import Any, ClassVar, Dict, List, Mapping, Optional, Sequence
 
 from easy_aso.supervisor.store.models import Device, Point
 
@@ -15,6 +15,15 @@ class ReadBatchResult:
     errors: Dict[str, str] = field(default_factory=dict)
 
 
+@dataclass(slots=True)
+class TrendReadResult:
+    """New trend-log records for one point, oldest first (ReadRange rows)."""
+
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    more: bool = False
+    resynced: bool = False  # cursor no longer valid; read from the oldest record
+
+
 class BaseDriver(ABC):
     """Async driver: one instance per poll ownership boundary (typically per device)."""
 
@@ -27,3 +36,13 @@ class BaseDriver(ABC):
     @abstractmethod
     async def read_points(self, device: Device, points: Sequence[Point]) -> ReadBatchResult:
         """Read all requested points (subset may be skipped if disabled upstream)."""
+
+    async def read_trend(
+        self,
+        device: Device,
+        point: Point,
+        after_sequence: Optional[int],
+        max_records: int,
+    ) -> TrendReadResult:
+        """Trend records logged after ``after_sequence`` (``None``: from the oldest)."""
+        raise NotImplementedError(f"driver {self.DRIVER_TYPE!r} does not read trend logs")
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
-from typing import ClassVar, Sequence
+from typing import ClassVar, Optional, Sequence
 
 from easy_aso.supervisor.store.models import Device, Point
 
-from .base import BaseDriver, ReadBatchResult
+from .base import BaseDriver, ReadBatchResult, TrendReadResult
 
 
 class StubDriver(BaseDriver):
     """Deterministic driver for tests and empty BACnet installs."""
 
     DRIVER_TYPE: ClassVar[str] = "stub"
+    TREND_RECORDS: ClassVar[int] = 10  # fixed log buffer, sequence numbers 1..10
 
     async def close(self) -> None:
         return None
@@ -20,3 +21,24 @@ class StubDriver(BaseDriver):
         for p in points:
             res.values[p.id] = {"stub": True, "object_identifier": p.object_identifier, "device": device.name}
         return res
+
+    async def read_trend(
+        self,
+        device: Device,
+        point: Point,
+        after_sequence: Optional[int],
+        max_records: int,
+    ) -> TrendReadResult:
+        first = (after_sequence or 0) + 1
+        last = min(self.TREND_RECORDS, first + max_records - 1)
+        records = [
+            {
+                "sequence": seq,
+                "timestamp": f"2024-01-01T00:{seq:02d}:00.00",
+                "kind": "real-value",
+                "value": float(seq),
+                "status_flags": [],
+            }
+            for seq in range(first, last + 1)
+        ]
+        return TrendReadResult(records=records, more=last < self.TREND_RECORDS)
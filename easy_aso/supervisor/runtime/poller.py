@@ -6,6 +6,8 @@ from easy_aso.supervisor.drivers.base import BaseDriver, ReadBatchResult
 from easy_aso.supervisor.store.models import Device, Point
 from easy_aso.supervisor.store.repository import SupervisorRepository
 
+from .trends import is_trend_point
+
 
 def _utc_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -34,7 +36,7 @@ async def run_one_poll(
     device: Device,
     driver: BaseDriver,
 ) -> tuple[ReadBatchResult, list[Point]]:
-    points = await repo.list_points(device.id, enabled_only=True)
+    points = [p for p in await repo.list_points(device.id, enabled_only=True) if not is_trend_point(p)]
     if not points:
         return ReadBatchResult(), []
     batch = await driver.read_points(device, points)
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import time
 from contextlib import suppress
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -11,6 +13,7 @@ from easy_aso.supervisor.drivers.factory import create_driver
 from easy_aso.supervisor.store.repository import SupervisorRepository
 
 from .poller import run_one_poll
+from .trends import run_trend_ingest
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +38,9 @@ class SupervisorRuntime:
         self._tasks: Dict[str, asyncio.Task[None]] = {}
         self._health: Dict[str, DeviceHealth] = {}
         self._lock = asyncio.Lock()
+        # trend logs (log-buffer points) are pulled with ReadRange on their own, slower cadence
+        self._trend_interval = float(os.environ.get("SUPERVISOR_TREND_INTERVAL_SECONDS", "300"))
+        self._trend_max_records = int(os.environ.get("SUPERVISOR_TREND_MAX_RECORDS", "1000"))
 
     def health_snapshot(self) -> Dict[str, DeviceHealth]:
         return dict(self._health)
@@ -101,6 +107,7 @@ class SupervisorRuntime:
                 self._tasks.pop(device_id, None)
 
     async def _device_poll_loop(self, device_id: str) -> None:
+        next_trend_at = 0.0
         try:
             while True:
                 device = await self._repo.get_device(device_id)
@@ -116,10 +123,14 @@ class SupervisorRuntime:
                 driver = create_driver(device)
                 try:
                     batch, points = await run_one_poll(self._repo, device, driver)
+                    errors = dict(batch.errors)
+                    if time.monotonic() >= next_trend_at:
+                        errors.update(await run_trend_ingest(self._repo, device, driver, self._trend_max_records))
+                        next_trend_at = time.monotonic() + self._trend_interval
                     h.last_poll_at = _utc_iso()
-                    if batch.errors:
+                    if errors:
                         h.status = "error"
-                        h.last_error = "; ".join(f"{k}: {v}" for k, v in batch.errors.items())
+                        h.last_error = "; ".join(f"{k}: {v}" for k, v in errors.items())
                     else:
                         h.status = "running"
                 except asyncio.CancelledError:
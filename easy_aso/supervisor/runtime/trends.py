@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Dict
+
+from easy_aso.supervisor.drivers.base import BaseDriver
+from easy_aso.supervisor.store.models import Device, Point
+from easy_aso.supervisor.store.repository import SupervisorRepository
+
+logger = logging.getLogger(__name__)
+
+TREND_PROPERTY = "log-buffer"
+
+# ReadRange calls per point and ingest, so a long backfill cannot hold the device loop
+MAX_READS_PER_INGEST = 10
+
+
+def _utc_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def is_trend_point(point: Point) -> bool:
+    """Points on a trend log's ``log-buffer`` are ingested with ReadRange, not polled."""
+    return point.property_identifier.strip().lower() == TREND_PROPERTY
+
+
+async def ingest_trend_point(
+    repo: SupervisorRepository,
+    device: Device,
+    driver: BaseDriver,
+    point: Point,
+    max_records: int,
+) -> int:
+    """Pull records logged since the stored cursor into ``trend_records``; returns rows added."""
+    cursor = await repo.get_trend_cursor(point.id)
+    added = 0
+    for _ in range(MAX_READS_PER_INGEST):
+        result = await driver.read_trend(device, point, cursor, max_records)
+        if result.resynced:
+            logger.warning(
+                "trend log reset or wrapped past cursor point_id=%s cursor=%s; reading from oldest record",
+                point.id,
+                cursor,
+            )
+            cursor = None
+            if not result.records:
+                await repo.store_trend_records(point.id, [], cursor=None)
+        if not result.records:
+            break
+        last = result.records[-1]
+        if last.get("sequence") is not None:
+            cursor = int(last["sequence"])
+        added += await repo.store_trend_records(point.id, result.records, cursor=cursor)
+        await repo.update_point_reading(point.id, value=last.get("value"), polled_at=_utc_iso(), error=None)
+        if not result.more:
+            break
+    return added
+
+
+async def run_trend_ingest(
+    repo: SupervisorRepository,
+    device: Device,
+    driver: BaseDriver,
+    max_records: int,
+) -> Dict[str, str]:
+    """Ingest every enabled trend point of ``device``; returns point id -> error."""
+    errors: Dict[str, str] = {}
+    points = [p for p in await repo.list_points(device.id, enabled_only=True) if is_trend_point(p)]
+    for p in points:
+        try:
+            added = await ingest_trend_point(repo, device, driver, p, max_records)
+        except Exception as exc:  # noqa: BLE001
+            errors[p.id] = str(exc)
+            await repo.update_point_reading(p.id, value=None, polled_at=_utc_iso(), error=str(exc))
+            continue
+        if added:
+            logger.info("trend ingest device_id=%s point_id=%s added=%d", device.id, p.id, added)
+    return errors
@@ -41,3 +41,20 @@ class Point:
             return json.loads(self.last_value_json)
         except json.JSONDecodeError:
             return self.last_value_json
+
+
+@dataclass(slots=True)
+class TrendRecord:
+    point_id: str
+    sequence: int
+    recorded_at: str
+    value_json: Optional[str]
+    status_flags_json: Optional[str]
+    ingested_at: str
+
+    def decoded_value(self) -> Any:
+        if self.value_json is None:
+            return None
+        import json
+
+        return json.loads(self.value_json)
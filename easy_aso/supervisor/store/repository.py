@@ -4,11 +4,11 @@ import asyncio
 import json
 import uuid
 from datetime import datetime, timezone
-from typing import Any, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence
 
 import aiosqlite
 
-from .models import Device, Point
+from .models import Device, Point, TrendRecord
 
 
 def _utc_iso() -> str:
@@ -50,6 +50,17 @@ def _row_point(row: aiosqlite.Row) -> Point:
     )
 
 
+def _row_trend(row: aiosqlite.Row) -> TrendRecord:
+    return TrendRecord(
+        point_id=row["point_id"],
+        sequence=int(row["sequence"]),
+        recorded_at=row["recorded_at"],
+        value_json=row["value_json"],
+        status_flags_json=row["status_flags_json"],
+        ingested_at=row["ingested_at"],
+    )
+
+
 class SupervisorRepository:
     """Async CRUD for devices and points (single connection, serialized writes)."""
 
@@ -260,3 +271,84 @@ class SupervisorRepository:
                 (payload, polled_at, error, polled_at, point_id),
             )
             await self._conn.commit()
+
+    async def get_trend_cursor(self, point_id: str) -> Optional[int]:
+        """Sequence number of the last trend record stored for ``point_id``."""
+        async with self._lock:
+            async with self._conn.execute(
+                "SELECT last_sequence FROM trend_cursors WHERE point_id = ?", (point_id,)
+            ) as cur:
+                row = await cur.fetchone()
+        if row is None or row["last_sequence"] is None:
+            return None
+        return int(row["last_sequence"])
+
+    async def store_trend_records(
+        self,
+        point_id: str,
+        records: Sequence[Dict[str, Any]],
+        *,
+        cursor: Optional[int],
+    ) -> int:
+        """Insert ReadRange rows (duplicates ignored) and move the cursor; one commit.
+
+        Returns the number of new rows.
+        """
+        now = _utc_iso()
+        rows = [
+            (
+                point_id,
+                int(r["sequence"]),
+                r["timestamp"],
+                json.dumps(r.get("value")),
+                json.dumps(r.get("status_flags")),
+                now,
+            )
+            for r in records
+            if r.get("sequence") is not None
+        ]
+        async with self._lock:
+            before = self._conn.total_changes
+            await self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO trend_records (
+                  point_id, sequence, recorded_at, value_json, status_flags_json, ingested_at
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            inserted = self._conn.total_changes - before
+            await self._conn.execute(
+                """
+                INSERT INTO trend_cursors (point_id, last_sequence, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(point_id) DO UPDATE SET
+                  last_sequence = excluded.last_sequence, updated_at = excluded.updated_at
+                """,
+                (point_id, cursor, now),
+            )
+            await self._conn.commit()
+        return inserted
+
+    async def list_trend_records(
+        self,
+        point_id: str,
+        *,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 1000,
+    ) -> List[TrendRecord]:
+        """Stored trend records for ``point_id``, oldest first."""
+        sql = "SELECT * FROM trend_records WHERE point_id = ?"
+        params: List[Any] = [point_id]
+        if since is not None:
+            sql += " AND recorded_at >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND recorded_at < ?"
+            params.append(until)
+        sql += " ORDER BY recorded_at, sequence LIMIT ?"
+        params.append(limit)
+        async with self._lock:
+            async with self._conn.execute(sql, params) as cur:
+                rows = await cur.fetchall()
+        return [_row_trend(r) for r in rows]
@@ -3,7 +3,7 @@ from __future__ import annotations
 import aiosqlite
 
 # Bump when adding migrations (simple PRAGMA user_version ladder).
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
 
 DDL_V1 = """
 CREATE TABLE IF NOT EXISTS devices (
@@ -37,16 +37,42 @@ CREATE TABLE IF NOT EXISTS points (
 CREATE INDEX IF NOT EXISTS idx_points_device_id ON points(device_id);
 """
 
+# Trend-log history pulled with ReadRange. A device that clears its log
+# restarts its sequence numbers, so the timestamp is part of the key.
+DDL_V2 = """
+CREATE TABLE IF NOT EXISTS trend_records (
+    point_id TEXT NOT NULL,
+    sequence INTEGER NOT NULL,
+    recorded_at TEXT NOT NULL,
+    value_json TEXT,
+    status_flags_json TEXT,
+    ingested_at TEXT NOT NULL,
+    PRIMARY KEY (point_id, sequence, recorded_at),
+    FOREIGN KEY (point_id) REFERENCES points(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_trend_records_time ON trend_records(point_id, recorded_at);
+
+CREATE TABLE IF NOT EXISTS trend_cursors (
+    point_id TEXT PRIMARY KEY,
+    last_sequence INTEGER,
+    updated_at TEXT NOT NULL,
+    FOREIGN KEY (point_id) REFERENCES points(id) ON DELETE CASCADE
+);
+"""
+
 
 async def migrate_schema(conn: aiosqlite.Connection) -> None:
     async with conn.execute("PRAGMA user_version") as cur:
         row = await cur.fetchone()
     version = int(row[0]) if row is not None else 0
-    if version < 1:
-        await conn.executescript(DDL_V1)
-        await conn.execute("PRAGMA user_version = 1")
-        await conn.commit()
-    elif version > SCHEMA_VERSION:
+    if version > SCHEMA_VERSION:
         raise RuntimeError(f"Database schema version {version} is newer than supported {SCHEMA_VERSION}")
-    else:
+    if version == SCHEMA_VERSION:
         return
+    if version < 1:
+        await conn.executescript(DDL_V1)
+    if version < 2:
+        await conn.executescript(DDL_V2)
+    await conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    await conn.commit()
@@ -52,6 +52,12 @@ class BuildingBot(EasyASO):
 
     async def on_start(self):
         print("BuildingBot started! Monitoring building HVAC system.")
+        # Polled before each step, one RPM per device; read from self.snapshot
+        self.outside_air_point, *self.vav_temp_points = self.subscribe_points(
+            [(BOILER_IP, BOILER_OUTSIDE_AIR_SENSOR)]
+            + [(address, VAV_ZONE_AIR_TEMP) for address in VAV_ADDRESSES],
+            interval_s=300,
+        )
         await asyncio.sleep(5)  # Simulating some startup delay
 
     async def on_stop(self):
@@ -60,9 +66,8 @@ class BuildingBot(EasyASO):
 
     async def on_step(self):
         """Keep track of everything at 2-second intervals."""
-        while True:
-            await self.check_all_conditions()  # This single task handles everything
-            await asyncio.sleep(2)  # Quick checks every 2 seconds
+        await self.check_all_conditions()  # This single task handles everything
+        await asyncio.sleep(2)  # Quick checks every 2 seconds
 
     def is_occupied(self):
         """Check if the building is occupied based on time and day."""
@@ -139,22 +144,35 @@ class BuildingBot(EasyASO):
                 "Building is unoccupied: Setting unoccupied setpoints and AHU to unoccupied mode."
             )
 
-        for address in VAV_ADDRESSES:
-            await self.bacnet_write(address, VAV_ZONE_SETPOINT, self.heat_setpoint, 16)
-
-        await self.bacnet_write(AHU_IP, AHU_OCCUPANCY, ahu_occupancy_value, 16)
+        # all VAVs at once; each device still gets its writes in order
+        targets = [(address, VAV_ZONE_SETPOINT, self.heat_setpoint) for address in VAV_ADDRESSES]
+        targets.append((AHU_IP, AHU_OCCUPANCY, ahu_occupancy_value))
+        writes = [
+            {"address": address, "object_identifier": obj, "value": value, "priority": 16}
+            for address, obj, value in targets
+        ]
+        for result in await self.write_many(writes):
+            if result["status"] != "success":
+                print(
+                    f"Write to {result['address']} {result['object_identifier']} failed: {result['detail']}"
+                )
 
     async def update_outside_air_temp(self):
         """Update the outside air temperature at regular intervals."""
-        outside_air_temp = await self.bacnet_read(BOILER_IP, BOILER_OUTSIDE_AIR_SENSOR)
+        outside_air_temp = self.snapshot.value(self.outside_air_point)
+        if outside_air_temp is None:
+            print("Outside air temperature not available yet.")
+            return
         await self.bacnet_write(AHU_IP, AHU_OUTSIDE_AIR_VALUE, outside_air_temp, 16)
 
     async def average_vav_zone_temp_and_control_ahu(self):
         """Average VAV zone temperature during unoccupied times and control AHU."""
-        temperatures = []
-        for address in VAV_ADDRESSES:
-            temp = await self.bacnet_read(address, VAV_ZONE_AIR_TEMP)
-            temperatures.append(temp)
+        # skip zones whose last read failed
+        temperatures = [
+            self.snapshot[point].value
+            for point in self.vav_temp_points
+            if self.snapshot[point].good
+        ]
 
         if temperatures:
             average_temp = sum(temperatures) / len(temperatures)
@@ -164,13 +182,10 @@ class BuildingBot(EasyASO):
             await self.bacnet_write(AHU_IP, AHU_ZONE_TEMP, average_temp, 16)
 
     async def release_all(self):
-        """Release all BACnet overrides."""
-        for address in VAV_ADDRESSES:
-            await self.bacnet_write(address, VAV_ZONE_SETPOINT, "null", 16)
-
-        await self.bacnet_write(AHU_IP, AHU_OCCUPANCY, "null", 16)
-        print("All BACnet overrides have been released.")
-
+        """Release all BACnet overrides this bot holds (tracked in self.overrides)."""
+        left = await self.release_overrides()
+        if not left:
+            print("All BACnet overrides have been released.")
 
 async def main():
     bot = BuildingBot()
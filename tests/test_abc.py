@@ -1,6 +1,11 @@
+import asyncio
+import os
+import tempfile
 import unittest
 from abc import ABC
+from types import SimpleNamespace
 from easy_aso.easy_aso import EasyASO
+from easy_aso.overrides import OverrideRegistry
 import argparse
 
 
@@ -66,5 +71,335 @@ class TestIncompleteEasyASO(unittest.TestCase):
             IncompleteEasyASO()
 
 
+class PointAgent(EasyASO):
+    async def on_start(self):
+        pass
+
+    async def on_step(self):
+        pass
+
+    async def on_stop(self):
+        pass
+
+
+class FakeApp:
+    """Records the parsed arguments the agent hands to the BACnet stack."""
+
+    def __init__(self):
+        self.calls = []
+        self.device_info_lookups = 0
+        self.device_info_cache = self
+
+    async def get_device_info(self, address):
+        self.device_info_lookups += 1
+        return SimpleNamespace(vendor_identifier=0, max_apdu_length_accepted=1476)
+
+    async def read_property(self, address, object_id, property_id, array_index=None):
+        self.calls.append(("read", address, object_id, property_id, array_index))
+        return 72.5
+
+    async def write_property(self, address, object_id, property_id, value, array_index, priority):
+        self.calls.append(("write", address, object_id, property_id, value, array_index, priority))
+
+    async def read_property_multiple(self, address, parameters):
+        self.calls.append(("rpm", address, parameters))
+        rows = []
+        for obj_id, references in zip(parameters[::2], parameters[1::2]):
+            for ref in references:
+                rows.append((obj_id, ref.propertyIdentifier, ref.propertyArrayIndex, 1.0))
+        return rows
+
+
+class TestPointHandles(unittest.TestCase):
+    def setUp(self):
+        self.agent = PointAgent(args=argparse.Namespace(no_bacnet_server=True))
+        self.agent.app = FakeApp()
+
+    def test_string_calls_parse_each_point_once(self):
+        async def steps():
+            for _ in range(3):
+                await self.agent.bacnet_read("10.0.0.5", "analog-value,1")
+                await self.agent.bacnet_write("10.0.0.5", "analog-value,1", 70, 8, "priority-array,8")
+
+        asyncio.run(steps())
+
+        self.assertEqual(self.agent.points.misses, 2)
+        self.assertEqual(self.agent.points.hits, 4)
+        read, write = self.agent.app.calls[:2]
+        self.assertEqual(str(read[1]), "10.0.0.5")
+        self.assertEqual(read[2:], (read[2], "present-value", None))
+        self.assertEqual(write[3:], ("priority-array", 70, 8, 8))
+        # the same parsed objects are reused on every step
+        self.assertIs(self.agent.app.calls[2][1], read[1])
+
+    def test_rpm_points_resolve_vendor_once(self):
+        points = [
+            self.agent.point("10.0.0.5", "analog-value,1"),
+            self.agent.point("10.0.0.5", "analog-value,1", "units"),
+            self.agent.point("10.0.0.5", "analog-input,2"),
+        ]
+
+        async def steps():
+            for _ in range(3):
+                await self.agent.rpm_points(points)
+
+        asyncio.run(steps())
+
+        self.assertEqual(self.agent.app.device_info_lookups, 1)
+        _, _, parameters = self.agent.app.calls[0]
+        self.assertEqual(len(parameters), 4)
+        self.assertEqual([str(r.propertyIdentifier) for r in parameters[1]], ["present-value", "units"])
+        self.assertEqual(
+            asyncio.run(self.agent.rpm_points([points[0], self.agent.point("10.0.0.6", "analog-value,1")]))[0].keys(),
+            {"error"},
+        )
+
+    def test_lru_evicts_least_recently_used(self):
+        self.agent.points.maxsize = 2
+        first = self.agent.point("10.0.0.5", "analog-value,1")
+        self.agent.point("10.0.0.5", "analog-value,2")
+        self.agent.point("10.0.0.5", "analog-value,1")
+        self.agent.point("10.0.0.5", "analog-value,3")
+        self.assertEqual(len(self.agent.points), 2)
+        self.assertIs(self.agent.point("10.0.0.5", "analog-value,1"), first)
+        self.agent.points.invalidate("10.0.0.5")
+        self.assertEqual(len(self.agent.points), 0)
+
+
+class TestPointSubscriptions(unittest.TestCase):
+    def test_lifecycle_refreshes_snapshot_before_each_step(self):
+        class Poller(PointAgent):
+            async def on_start(self):
+                self.subscribe_points(
+                    [("10.0.0.5", "analog-value,1"), ("10.0.0.5", "analog-value,2"), ("10.0.0.6", "analog-input,1")],
+                    interval_s=0,
+                )
+                self.seen = []
+
+            async def on_step(self):
+                self.seen.append(self.snapshot)
+                if len(self.seen) == 2:
+                    self.stop_event.set()
+
+        agent = Poller(args=argparse.Namespace(no_bacnet_server=True))
+        agent.app = FakeApp()
+        asyncio.run(agent.run_lifecycle())
+
+        rpms = [call for call in agent.app.calls if call[0] == "rpm"]
+        self.assertEqual(len(rpms), 4)  # one per device per step
+        first, second = agent.seen
+        self.assertIsNot(first, second)
+        self.assertEqual(first.value(("10.0.0.5", "analog-value,2")), 1.0)
+        self.assertTrue(all(v.good for v in second.values()))
+        self.assertLessEqual(first.taken_at, second.taken_at)
+
+
+class WritingApp(FakeApp):
+    """Accepts WritePropertyMultiple except from 10.0.0.7, which only knows WriteProperty."""
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.peak = 0
+
+    async def request(self, request):
+        from bacpypes3.apdu import RejectPDU, RejectReason
+
+        address = str(request.pduDestination)
+        sent = [
+            (str(spec.objectIdentifier), str(pv.propertyIdentifier), pv.priority)
+            for spec in request.listOfWriteAccessSpecs
+            for pv in spec.listOfProperties
+        ]
+        self.calls.append(("wpm", address, sent))
+        if address == "10.0.0.7":
+            raise RejectPDU(reason=RejectReason.unrecognizedService)
+
+    async def write_property(self, address, object_id, property_id, value, array_index, priority):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        await super().write_property(address, object_id, property_id, value, array_index, priority)
+
+
+class TestWriteMany(unittest.TestCase):
+    def setUp(self):
+        self.agent = PointAgent(args=argparse.Namespace(no_bacnet_server=True))
+        self.agent.app = WritingApp()
+
+    def test_write_many_batches_per_device_and_keeps_order(self):
+        writes = [
+            {"address": "10.0.0.5", "object_identifier": "analog-value,1", "value": 70.0, "priority": 16},
+            {"address": "10.0.0.7", "object_identifier": "analog-value,1", "value": 71.0, "priority": 16},
+            {"address": "10.0.0.5", "object_identifier": "analog-value,2", "value": 72.0, "priority": 16},
+            {"address": "10.0.0.7", "object_identifier": "analog-value,2", "value": 73.0, "priority": 16},
+            {"address": "10.0.0.7", "object_identifier": "analog-value,1", "value": "null", "priority": -1},
+        ]
+        results = asyncio.run(self.agent.write_many(writes))
+
+        self.assertEqual([r["status"] for r in results], ["success"] * 4 + ["error"])
+        self.assertIn("null", results[4]["detail"])
+        wpms = [c for c in self.agent.app.calls if c[0] == "wpm"]
+        self.assertIn(
+            ("wpm", "10.0.0.5", [("analog-value,1", "present-value", 16), ("analog-value,2", "present-value", 16)]),
+            wpms,
+        )
+        # 10.0.0.7 rejected WPM: one WriteProperty at a time, in request order
+        singles = [(c[2][1], c[4]) for c in self.agent.app.calls if c[0] == "write"]
+        self.assertEqual(singles, [(1, 71.0), (2, 73.0)])
+        self.assertEqual(self.agent.app.peak, 1)
+
+    def test_wpm_failure_on_a_point_written_twice_retries_each_write(self):
+        from bacpypes3.apdu import ErrorType, WritePropertyMultipleError
+        from bacpypes3.basetypes import ObjectPropertyReference
+
+        async def request(request):
+            raise WritePropertyMultipleError(
+                errorType=ErrorType(errorClass="property", errorCode="write-access-denied"),
+                firstFailedWriteAttempt=ObjectPropertyReference(
+                    objectIdentifier="analog-value,1", propertyIdentifier="present-value"
+                ),
+            )
+
+        self.agent.app.request = request
+        writes = [
+            {"address": "10.0.0.8", "object_identifier": "analog-value,1", "value": 70.0, "priority": 16},
+            {"address": "10.0.0.8", "object_identifier": "analog-value,2", "value": 71.0, "priority": 16},
+            {"address": "10.0.0.8", "object_identifier": "analog-value,1", "value": 72.0, "priority": 16},
+        ]
+        results = asyncio.run(self.agent.write_many(writes))
+
+        # either write to analog-value,1 may have failed, so none is blamed from the WPM
+        self.assertEqual([r["status"] for r in results], ["success"] * 3)
+        singles = [(c[2][1], c[4]) for c in self.agent.app.calls if c[0] == "write"]
+        self.assertEqual(singles, [(1, 70.0), (2, 71.0), (1, 72.0)])
+
+    def test_release_many_writes_null_at_the_priority(self):
+        results = asyncio.run(
+            self.agent.release_many(
+                [("10.0.0.5", "analog-value,1"), self.agent.point("10.0.0.6", "binary-value,3")], 8
+            )
+        )
+        self.assertEqual([(r["address"], r["status"]) for r in results], [("10.0.0.5", "success"), ("10.0.0.6", "success")])
+        singles = [c for c in self.agent.app.calls if c[0] == "write"]
+        self.assertEqual([c[6] for c in singles], [8, 8])
+        self.assertEqual({type(c[4]).__name__ for c in singles}, {"Null"})
+
+
+class HangingApp(WritingApp):
+    """Once ``hang`` is set, never answers 10.0.0.9, like a device that dropped off the network."""
+
+    hang = False
+
+    async def write_property(self, address, object_id, property_id, value, array_index, priority):
+        if self.hang and str(address) == "10.0.0.9":
+            await asyncio.sleep(60)
+        await super().write_property(address, object_id, property_id, value, array_index, priority)
+
+
+class TestOverrideRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "overrides.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_registry_tracks_overrides_and_persists(self):
+        registry = OverrideRegistry(self.path)
+        registry.record("10.0.0.5", "analog-value,1", 70.0, 16)
+        registry.record("10.0.0.5", "analog-value,1", 71.0, 16)  # same override, new value
+        registry.record("10.0.0.5", "analog-value,1", 65.0, 8)
+        registry.record("10.0.0.5", "analog-value,2", 70.0, None)  # no priority: not an override
+        registry.record("10.0.0.5", "analog-value,1", "null", 8)
+        self.assertEqual(len(registry), 1)
+
+        reloaded = OverrideRegistry(self.path)
+        self.assertEqual(
+            reloaded.release_writes(),
+            [{"address": "10.0.0.5", "object_identifier": "analog-value,1",
+              "property_identifier": "present-value", "value": "null", "priority": 16}],
+        )
+
+    def test_null_write_releases_the_tracked_override(self):
+        agent = PointAgent(args=argparse.Namespace(no_bacnet_server=True))
+        agent.app = FakeApp()
+
+        async def override_then_release():
+            await agent.bacnet_write("10.0.0.5", "analog-value,1", 70.0, 8)
+            self.assertEqual(len(agent.overrides), 1)
+            await agent.bacnet_write("10.0.0.5", "analog-value,1", "null", 8)
+            # releasing a point that was never overridden does not track it
+            await agent.bacnet_write("10.0.0.5", "analog-value,2", "null", 9)
+
+        asyncio.run(override_then_release())
+        self.assertEqual(agent.overrides.entries(), [])
+
+    def test_stop_releases_within_deadline_and_restart_cleans_up(self):
+        os.environ["EASY_ASO_OVERRIDE_REGISTRY"] = self.path
+        self.addCleanup(os.environ.pop, "EASY_ASO_OVERRIDE_REGISTRY")
+
+        class Overrider(PointAgent):
+            async def on_step(self):
+                for address in ("10.0.0.5", "10.0.0.6"):
+                    await self.bacnet_write(address, "analog-value,1", 70.0, 16)
+                await self.write_many(
+                    [{"address": "10.0.0.9", "object_identifier": "analog-value,1", "value": 1, "priority": 16}]
+                )
+                self.stop_event.set()
+
+        agent = Overrider(args=argparse.Namespace(no_bacnet_server=True))
+        agent.app = HangingApp()
+        agent.release_deadline_s = 0.2
+
+        async def first_run():
+            await agent.on_start()
+            await agent.on_step()
+            agent.app.hang = True
+            return await agent.release_overrides()
+
+        left = asyncio.run(first_run())
+        self.assertEqual([e["address"] for e in left], ["10.0.0.9"])
+        released = [c for c in agent.app.calls if c[0] == "write" and type(c[4]).__name__ == "Null"]
+        self.assertEqual(sorted(str(c[1]) for c in released), ["10.0.0.5", "10.0.0.6"])
+
+        # the next start releases what the last one could not
+        restarted = PointAgent(args=argparse.Namespace(no_bacnet_server=True))
+        restarted.app = WritingApp()
+        restarted.stop_event.set()
+        asyncio.run(restarted.run_lifecycle())
+        self.assertEqual(len(restarted.overrides), 0)
+        self.assertEqual(len(OverrideRegistry(self.path)), 0)
+        self.assertEqual([str(c[1]) for c in restarted.app.calls if c[0] == "write"], ["10.0.0.9"])
+
+
+    def test_stop_signal_during_lifecycle_stops_and_releases_once(self):
+        stops = []
+
+        class Overrider(PointAgent):
+            async def on_step(self):
+                await self.bacnet_write("10.0.0.5", "analog-value,1", 70.0, 16)
+                await asyncio.sleep(0.01)
+
+            async def on_stop(self):
+                stops.append(len(self.overrides))
+                await asyncio.sleep(0.01)
+
+        agent = Overrider(args=argparse.Namespace(no_bacnet_server=True))
+        agent.app = WritingApp()
+
+        async def signalled():
+            lifecycle = asyncio.ensure_future(agent.run_lifecycle())
+            await asyncio.sleep(0.05)
+            await agent.stop_handler()
+            await asyncio.gather(lifecycle, return_exceptions=True)
+
+        asyncio.run(signalled())
+        self.assertEqual(stops, [1])
+        self.assertEqual(len(agent.overrides), 0)
+        released = [c for c in agent.app.calls if c[0] == "write" and type(c[4]).__name__ == "Null"]
+        self.assertEqual([(str(c[1]), c[6]) for c in released], [("10.0.0.5", 16)])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,83 @@
+"""easy_aso's encoder is a copy of diy-bacnet-server's; both must give the same JSON."""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+from bacpypes3.apdu import ErrorType
+from bacpypes3.basetypes import DateTime, EngineeringUnits, PriorityArray, PriorityValue, StatusFlags
+from bacpypes3.constructeddata import AnyAtomic
+from bacpypes3.primitivedata import (
+    Boolean,
+    CharacterString,
+    Date,
+    Double,
+    Integer,
+    Null,
+    ObjectIdentifier,
+    OctetString,
+    PropertyIdentifier,
+    Real,
+    Time,
+    Unsigned,
+)
+
+from easy_aso.bacnet_client import encoding
+
+SERVER_ENCODER = Path(__file__).resolve().parents[1] / "vendor" / "diy-bacnet-server" / "bacpypes_server" / "encoder.py"
+
+
+@pytest.fixture(scope="module")
+def server():
+    if not SERVER_ENCODER.exists():
+        pytest.skip("diy-bacnet-server is not vendored in this tree")
+    spec = importlib.util.spec_from_file_location("_server_encoder", SERVER_ENCODER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _priority_array() -> PriorityArray:
+    array = PriorityArray([PriorityValue(null=()) for _ in range(16)])
+    array[7] = PriorityValue(real=55.0)
+    return array
+
+
+SAMPLES = [
+    Real(72.5),
+    Double(0.1),
+    Unsigned(3),
+    Integer(-2),
+    Boolean(True),
+    CharacterString("ZN-T"),
+    EngineeringUnits("degrees-fahrenheit"),
+    StatusFlags([0, 1, 0, 1]),
+    ObjectIdentifier("analog-input,1"),
+    Null(()),
+    OctetString(b"\x01\x02"),
+    Date("2024-01-02"),
+    Time("12:00:00"),
+    AnyAtomic(Real(2.0)),
+    _priority_array(),
+    DateTime(date=Date("2024-01-02"), time=Time("12:00:00")),
+    ErrorType(errorClass="property", errorCode="unknown-property"),
+    {"a": [Real(1.0), None, "x"]},
+]
+
+
+@pytest.mark.parametrize("value", SAMPLES, ids=lambda value: type(value).__name__)
+def test_values_encode_like_the_server(server, value) -> None:
+    assert encoding.encode_value(value) == server.encode_value(value)
+
+
+def test_rpm_rows_encode_like_the_server(server) -> None:
+    object_id = ObjectIdentifier("analog-value,4")
+    response = [
+        (object_id, PropertyIdentifier("present-value"), None, Real(21.5)),
+        (object_id, PropertyIdentifier("priority-array"), None, _priority_array()),
+        (object_id, PropertyIdentifier("priority-array"), 8, PriorityValue(real=55.0)),
+        (object_id, PropertyIdentifier("units"), None, ErrorType(errorClass="property", errorCode="unknown-property")),
+    ]
+    assert encoding.encode_rpm_response(response) == server.encode_rpm_response(response)
@@ -0,0 +1,227 @@
+"""Tests for the legacy bacnet-gateway: batch endpoints, device queues and deadlines."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+import easy_aso.gateway.app as gateway
+from easy_aso.bacnet_client.base import BacnetClient
+from easy_aso.bacnet_client.remote_client import RemoteBacnetClient
+from easy_aso.gateway.queues import QueuedBacnetClient
+
+
+class FakeBacnet(BacnetClient):
+    """Answers reads after a short delay and records how many were in flight."""
+
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.reads: List[str] = []
+        self.in_flight: Dict[str, int] = {}
+        self.peak_total = 0
+        self.peak_device: Dict[str, int] = {}
+
+    async def read(self, address: str, object_identifier: str, property_identifier: str = "present-value") -> Any:
+        self.reads.append(object_identifier)
+        self.in_flight[address] = self.in_flight.get(address, 0) + 1
+        self.peak_total = max(self.peak_total, sum(self.in_flight.values()))
+        self.peak_device[address] = max(self.peak_device.get(address, 0), self.in_flight[address])
+        try:
+            await asyncio.sleep(self.delay)
+            if object_identifier == "analog-value,99":
+                raise RuntimeError("BACnet read failed: object, unknown-object")
+            return float(object_identifier.split(",")[1])
+        finally:
+            self.in_flight[address] -= 1
+
+    async def write(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    async def rpm(self, address: str, *args: str) -> List[Dict[str, Any]]:
+        if address == "10.0.0.9":
+            return [{"error": "Error during RPM: no-response"}]
+        return [
+            {"object_identifier": args[i], "property_identifier": args[i + 1], "value": 1.0}
+            for i in range(0, len(args), 2)
+        ]
+
+
+@pytest.fixture
+def remote(monkeypatch: pytest.MonkeyPatch):
+    fake = FakeBacnet()
+    monkeypatch.setattr(gateway, "_client", QueuedBacnetClient(fake))
+    client = RemoteBacnetClient("http://gateway")
+    client._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=gateway.app))
+    return client, fake
+
+
+@pytest.mark.asyncio
+async def test_read_many_keeps_order_reports_errors_and_bounds_concurrency(remote) -> None:
+    client, fake = remote
+    reads = [
+        {"address": f"10.0.0.{d}", "object_identifier": f"analog-value,{i}"}
+        for i in range(6)
+        for d in (1, 2, 3)
+    ]
+    reads.insert(4, {"address": "10.0.0.1", "object_identifier": "analog-value,99"})
+
+    results = await client.read_many(reads, concurrency=4)
+    await client.close()
+
+    assert [(r["address"], r["object_identifier"]) for r in results] == [
+        (r["address"], r["object_identifier"]) for r in reads
+    ]
+    failed = results[4]
+    assert failed["status"] == "error" and "unknown-object" in failed["detail"]
+    assert failed["value"] is None
+    assert [r["value"] for r in results[:4]] == [0.0, 0.0, 0.0, 1.0]
+    assert all(r["status"] == "success" for i, r in enumerate(results) if i != 4)
+    assert fake.peak_total == 4
+    assert max(fake.peak_device.values()) == 2
+
+
+@pytest.mark.asyncio
+async def test_rpm_many(remote) -> None:
+    client, _ = remote
+    results = await client.rpm_many(
+        [
+            {"address": "10.0.0.1", "args": ["analog-value,1", "present-value", "analog-value,2", "units"]},
+            {"address": "10.0.0.9", "args": ["analog-value,1", "present-value"]},
+        ]
+    )
+    await client.close()
+
+    assert results[0]["status"] == "success"
+    assert [row["object_identifier"] for row in results[0]["results"]] == ["analog-value,1", "analog-value,2"]
+    assert results[1] == {
+        "address": "10.0.0.9",
+        "status": "error",
+        "results": [],
+        "detail": "Error during RPM: no-response",
+    }
+
+
+@pytest.mark.asyncio
+async def test_batches_above_the_gateway_limits_are_sent_in_chunks(remote, monkeypatch: pytest.MonkeyPatch) -> None:
+    import easy_aso.bacnet_client.remote_client as remote_client
+
+    client, fake = remote
+    fake.delay = 0
+    posts: List[int] = []
+
+    async def post(url, json):
+        posts.append(len(json.get("reads") or json.get("requests") or json.get("writes")))
+        return await send(url, json=json)
+
+    send = client._client.post
+    monkeypatch.setattr(client._client, "post", post)
+
+    reads = [{"address": "10.0.0.1", "object_identifier": f"analog-value,{i}"} for i in range(2500)]
+    results = await client.read_many(reads, concurrency=500)
+    assert [r["object_identifier"] for r in results] == [r["object_identifier"] for r in reads]
+    assert results[2499]["value"] == 2499.0
+
+    rpms = [{"address": "10.0.0.1", "args": ["analog-value,1", "present-value"]}] * 501
+    assert len(await client.rpm_many(rpms)) == 501
+
+    writes = [{"address": "10.0.0.1", "object_identifier": "analog-value,1", "value": 1}] * 2001
+    assert len(await client.write_many(writes)) == 2001
+    await client.close()
+
+    assert posts == [2000, 500, 500, 1, 2000, 1]
+
+
+@pytest.mark.asyncio
+async def test_read_many_rejects_an_empty_batch(remote) -> None:
+    client, _ = remote
+    assert await client.read_many([]) == []
+    response = await client._client.post("http://gateway/read_many", json={"reads": []})
+    assert response.status_code == 422
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_limits_each_device_and_merges_identical_reads() -> None:
+    fake = FakeBacnet()
+    queued = QueuedBacnetClient(fake, max_outstanding=1)
+
+    values = await asyncio.gather(
+        queued.read("10.0.0.1", "analog-value,1"),
+        queued.read("10.0.0.1", "analog-value,1"),
+        queued.read("10.0.0.1", "analog-value,2"),
+        queued.read("10.0.0.2", "analog-value,3"),
+    )
+
+    assert values == [1.0, 1.0, 2.0, 3.0]
+    assert sorted(fake.reads) == ["analog-value,1", "analog-value,2", "analog-value,3"]
+    assert queued.merged_reads == 1
+    assert fake.peak_device == {"10.0.0.1": 1, "10.0.0.2": 1}
+    assert fake.peak_total == 2  # the other device was not held up
+    assert queued.status() == {}
+    assert queued._slots == queued._queued == queued._outstanding == {}
+
+
+@pytest.mark.asyncio
+async def test_a_merged_read_survives_one_caller_leaving() -> None:
+    fake = FakeBacnet(delay=0.05)
+    queued = QueuedBacnetClient(fake)
+    leaving = asyncio.ensure_future(queued.read("10.0.0.1", "analog-value,4"))
+    staying = asyncio.ensure_future(queued.read("10.0.0.1", "analog-value,4"))
+    await asyncio.sleep(0.01)
+    leaving.cancel()
+
+    assert await staying == 4.0
+    assert fake.reads == ["analog-value,4"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_queued_work(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = FakeBacnet(delay=0.2)
+    queued = QueuedBacnetClient(fake, max_outstanding=1)
+    monkeypatch.setattr(gateway, "_client", queued)
+    transport = httpx.ASGITransport(app=gateway.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as http:
+        slow, late = await asyncio.gather(
+            http.post("/read", json={"address": "10.0.0.1", "object_identifier": "analog-value,5"}),
+            http.post(
+                "/read",
+                json={"address": "10.0.0.1", "object_identifier": "analog-value,6"},
+                headers={"X-Request-Timeout": "0.05"},
+            ),
+        )
+        status = (await http.get("/queues")).json()
+
+    assert slow.json() == {"value": 5.0}
+    assert late.status_code == 504
+    assert fake.reads == ["analog-value,5"]  # the late read never reached the device
+    assert status == {"max_outstanding": 1, "devices": {}, "merged_reads": 0}
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_queued_work(monkeypatch: pytest.MonkeyPatch) -> None:
+    from starlette.requests import Request
+
+    fake = FakeBacnet(delay=0.1)
+    queued = QueuedBacnetClient(fake, max_outstanding=1)
+    hung_up = asyncio.Event()
+
+    async def receive() -> Dict[str, Any]:
+        await hung_up.wait()
+        return {"type": "http.disconnect"}
+
+    request = Request({"type": "http", "headers": []}, receive)
+    busy = asyncio.ensure_future(queued.read("10.0.0.1", "analog-value,7"))
+    waiting = asyncio.ensure_future(gateway._bounded(request, queued.read("10.0.0.1", "analog-value,8")))
+    await asyncio.sleep(0.01)
+    assert queued.status() == {"10.0.0.1": {"outstanding": 1, "queued": 1}}
+    hung_up.set()
+
+    with pytest.raises(gateway.HTTPException) as err:
+        await waiting
+    assert err.value.status_code == 499
+    assert await busy == 7.0
+    assert fake.reads == ["analog-value,7"]
+    assert queued._slots == queued._queued == queued._outstanding == {}
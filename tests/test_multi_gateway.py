@@ -0,0 +1,285 @@
+"""Tests for routing and failover across several diy-bacnet-server gateways."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Callable, Dict, List
+
+import httpx
+import pytest
+
+from easy_aso.bacnet_client.multi_gateway import (
+    GatewayRoute,
+    MultiGatewayBacnetClient,
+    parse_gateway_routes,
+)
+from easy_aso.runtime.env import BacnetRpcConfig, load_rpc_config_from_env
+from easy_aso.runtime.rpc_docked import RpcDockedEasyASO
+
+
+def _result(body: dict, result) -> httpx.Response:
+    return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": result})
+
+
+def _pool(spec: str, handler: Callable, **kwargs) -> MultiGatewayBacnetClient:
+    """Pool whose gateways all answer through ``handler(host, body)``."""
+    pool = MultiGatewayBacnetClient(parse_gateway_routes(spec), **kwargs)
+    for gw in pool._gateways:
+        gw.client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return pool
+
+
+def test_parse_gateway_routes() -> None:
+    routes = parse_gateway_routes("http://a:8080/=1000-1999,5000; http://b:8080=1000-1999\nhttp://c:8080")
+    assert routes == (
+        GatewayRoute("http://a:8080", ((1000, 1999), (5000, 5000))),
+        GatewayRoute("http://b:8080", ((1000, 1999),)),
+        GatewayRoute("http://c:8080"),
+    )
+    assert parse_gateway_routes("") == ()
+    with pytest.raises(ValueError):
+        parse_gateway_routes("http://a=20-10")
+
+
+@pytest.mark.asyncio
+async def test_routes_by_device_instance() -> None:
+    seen: List[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.host)
+        return _result(json.loads(request.content), {"present-value": 1.0})
+
+    pool = _pool("http://a=1000-1999 http://b=5000 http://c", handler)
+    await pool.read("1500", "analog-value,1")
+    await pool.read("device:5000", "analog-value,1")
+    await pool.read("42", "analog-value,1")
+    assert seen == ["a", "b", "c"]
+
+    strict = _pool("http://a=1000-1999", handler)
+    with pytest.raises(LookupError):
+        await strict.read("42", "analog-value,1")
+    await pool.close()
+    await strict.close()
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_among_equivalent_gateways() -> None:
+    in_flight: Dict[str, int] = {"a": 0, "b": 0}
+    peak: Dict[str, int] = {"a": 0, "b": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        in_flight[host] += 1
+        peak[host] = max(peak[host], in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return _result(json.loads(request.content), {"present-value": 1.0})
+
+    pool = _pool("http://a=1-99 http://b=1-99", handler)
+    await asyncio.gather(*(pool.read("7", f"analog-value,{i}") for i in range(10)))
+    assert peak == {"a": 5, "b": 5}
+    assert [s["requests"] for s in pool.status()] == [5, 5]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_failover_marks_gateway_down_and_probes_before_reuse() -> None:
+    calls: List[tuple] = []
+    a_up = False
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        calls.append((request.url.host, body["method"]))
+        if request.url.host == "a" and not a_up:
+            raise httpx.ConnectError("refused", request=request)
+        return _result(body, {"present-value": 2.0})
+
+    pool = _pool("http://a http://b", handler, retry_after_s=0.05)
+    assert await pool.read("7", "analog-value,1") == 2.0
+    assert calls == [("a", "client_read_property"), ("b", "client_read_property")]
+    assert [s["healthy"] for s in pool.status()] == [False, True]
+
+    calls.clear()
+    await pool.read("7", "analog-value,1")
+    assert calls == [("b", "client_read_property")]
+
+    # once due, the gateway is probed in the background while b carries the load
+    await asyncio.sleep(0.06)
+    a_up = True
+    calls.clear()
+    await pool.read("7", "analog-value,1")
+    await asyncio.sleep(0.01)
+    assert sorted(calls) == [("a", "server_hello"), ("b", "client_read_property")]
+    assert all(s["healthy"] for s in pool.status())
+
+    calls.clear()
+    await pool.read("7", "analog-value,1")
+    assert calls == [("a", "client_read_property")]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_probes_inline_when_no_gateway_is_healthy() -> None:
+    calls: List[tuple] = []
+    refuse = True
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        calls.append((request.url.host, body["method"]))
+        if refuse:
+            raise httpx.ConnectError("refused", request=request)
+        return _result(body, {"present-value": 3.0})
+
+    pool = _pool("http://a", handler, retry_after_s=0.01)
+    with pytest.raises(httpx.ConnectError):
+        await pool.read("7", "analog-value,1")
+    await asyncio.sleep(0.02)
+    refuse = False
+    calls.clear()
+    assert await pool.read("7", "analog-value,1") == 3.0
+    assert calls == [("a", "server_hello"), ("a", "client_read_property")]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_writes_fail_over_only_when_not_sent() -> None:
+    calls: List[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.host)
+        if request.url.host == "a":
+            return httpx.Response(502)
+        return _result(json.loads(request.content), {"success": True})
+
+    pool = _pool("http://a http://b", handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        await pool.write("7", "analog-value,1", 70.0, priority=8)
+    # the gateway may have acted on the write, so it is not repeated elsewhere
+    assert calls == ["a"]
+    await pool.write("7", "analog-value,1", 70.0, priority=8)
+    assert calls == ["a", "b"]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_jsonrpc_errors_do_not_fail_over() -> None:
+    calls: List[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.host)
+        body = json.loads(request.content)
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "error": {"code": 1001}})
+
+    pool = _pool("http://a http://b", handler)
+    with pytest.raises(RuntimeError):
+        await pool.read("7", "analog-value,1")
+    assert calls == ["a"]
+    assert all(s["healthy"] for s in pool.status())
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_write_many_splits_by_gateway_and_keeps_order() -> None:
+    batches: Dict[str, List[int]] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        writes = body["params"]["request"]["writes"]
+        batches[request.url.host] = [w["device_instance"] for w in writes]
+        rows = [{**w, "status": "success", "detail": None} for w in writes]
+        return _result(body, {"data": {"results": rows}})
+
+    pool = _pool("http://a=100-199 http://b=200-299", handler)
+    out = await pool.write_many(
+        [
+            {"address": "101", "object_identifier": "analog-value,1", "value": 1},
+            {"address": "201", "object_identifier": "analog-value,1", "value": 2},
+            {"address": "102", "object_identifier": "analog-value,1", "value": 3},
+        ]
+    )
+    assert batches == {"a": [101, 102], "b": [201]}
+    assert [r["address"] for r in out] == ["101", "201", "102"]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_write_many_reports_a_failed_gateway_per_write() -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if request.url.host == "b":
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "error": {"message": "boom"}})
+        rows = [{**w, "status": "success", "detail": None} for w in body["params"]["request"]["writes"]]
+        return _result(body, {"data": {"results": rows}})
+
+    pool = _pool("http://a=100-199 http://b=200-299", handler)
+    out = await pool.write_many(
+        [
+            {"address": "101", "object_identifier": "analog-value,1", "value": 1},
+            {"address": "201", "object_identifier": "analog-value,1", "value": 2},
+            {"address": "999", "object_identifier": "analog-value,1", "value": 3},
+        ]
+    )
+    assert out[0]["status"] == "success"
+    assert out[1]["status"] == "error" and "boom" in out[1]["detail"]
+    assert out[2]["status"] == "error" and "No BACnet gateway" in out[2]["detail"]
+    await pool.close()
+
+
+def test_load_rpc_config_reads_gateways(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SUPERVISOR_BACNET_RPC_GATEWAYS", "http://a=1-9 http://b")
+    cfg = load_rpc_config_from_env()
+    assert [g.base_url for g in cfg.gateways] == ["http://a", "http://b"]
+    monkeypatch.delenv("SUPERVISOR_BACNET_RPC_GATEWAYS")
+    assert load_rpc_config_from_env().gateways == ()
+
+
+@pytest.mark.asyncio
+async def test_rpc_docked_uses_gateway_pool() -> None:
+    import argparse
+
+    class Agent(RpcDockedEasyASO):
+        async def on_start(self) -> None:
+            pass
+
+        async def on_step(self) -> None:
+            pass
+
+        async def on_stop(self) -> None:
+            await self.close_rpc_dock()
+
+    p = argparse.ArgumentParser()
+    p.add_argument("--no-bacnet-server", action="store_true")
+    cfg = BacnetRpcConfig("http://unused", "/api", gateways=parse_gateway_routes("http://a http://b"))
+    bot = Agent(args=p.parse_args(["--no-bacnet-server"]), rpc_config=cfg)
+    await bot.create_application()
+    assert isinstance(bot._rpc, MultiGatewayBacnetClient)
+    await bot.close_rpc_dock()
+
+
+@pytest.mark.asyncio
+async def test_supervisor_driver_shares_gateway_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    from easy_aso.supervisor.drivers import bacnet_jsonrpc
+    from easy_aso.supervisor.drivers.bacnet_jsonrpc import BacnetJsonRpcDriver
+    from easy_aso.supervisor.store.models import Device
+
+    monkeypatch.setenv("SUPERVISOR_BACNET_RPC_GATEWAYS", "http://a http://b")
+    monkeypatch.setattr(bacnet_jsonrpc, "_gateway_pools", {})
+    device = Device(
+        id="d1",
+        name="vav",
+        driver_type="bacnet_jsonrpc",
+        device_address="7",
+        rpc_base_url=None,
+        rpc_entrypoint=None,
+        enabled=True,
+        scrape_interval_seconds=60,
+        created_at="",
+        updated_at="",
+    )
+    first, second = BacnetJsonRpcDriver(device), BacnetJsonRpcDriver(device)
+    assert first._client is second._client
+    assert isinstance(first._client, MultiGatewayBacnetClient)
+    await first.close()
+    assert not first._client._gateways[0].client._client.is_closed
+    await first._client.close()
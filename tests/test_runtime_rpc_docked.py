@@ -52,6 +52,16 @@ def test_load_rpc_config_from_env_custom(monkeypatch: pytest.MonkeyPatch) -> Non
     assert cfg.bearer_token == "secret"
 
 
+def test_load_rpc_config_from_env_transport(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("SUPERVISOR_BACNET_RPC_TRANSPORT", raising=False)
+    assert load_rpc_config_from_env().transport == "http"
+    monkeypatch.setenv("SUPERVISOR_BACNET_RPC_TRANSPORT", "WS")
+    assert load_rpc_config_from_env().transport == "ws"
+    monkeypatch.setenv("SUPERVISOR_BACNET_RPC_TRANSPORT", "grpc")
+    with pytest.raises(ValueError):
+        load_rpc_config_from_env()
+
+
 @pytest.mark.asyncio
 async def test_rpc_docked_create_application_uses_injected_config(monkeypatch: pytest.MonkeyPatch) -> None:
     captured: dict = {}
@@ -116,6 +126,372 @@ async def test_rpc_docked_bacnet_rpm_delegates(monkeypatch: pytest.MonkeyPatch)
     await bot.close_rpc_dock()
 
 
+@pytest.mark.asyncio
+async def test_rpc_docked_point_handles_delegate() -> None:
+    import json
+
+    import httpx
+
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        calls.append(body)
+        req = body["params"]["request"]
+        if body["method"] == "client_read_property":
+            result = {req["property_identifier"]: 42.0}
+        else:
+            result = {"data": {"results": [{**r, "value": 1.0} for r in req["requests"]]}}
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": result})
+
+    bot = _StubRpcDocked(args=_no_server_args(), rpc_config=BacnetRpcConfig("http://h", "/api"))
+    await bot.create_application()
+    bot._rpc._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    # device instances are not BACnet addresses; handles must not need one here
+    sat = bot.point("201201", "analog-value,1")
+    assert await bot.read_point(sat) == 42.0
+    assert calls[0]["params"]["request"] == {
+        "device_instance": 201201,
+        "object_identifier": "analog-value,1",
+        "property_identifier": "present-value",
+    }
+
+    points = [sat, bot.point("201201", "analog-value,1", "units"), bot.point("201201", "analog-input,2")]
+    rows = await bot.rpm_points(points)
+    pairs = [("analog-value,1", "present-value"), ("analog-value,1", "units"), ("analog-input,2", "present-value")]
+    assert calls[1]["method"] == "client_read_multiple"
+    assert calls[1]["params"]["request"] == {
+        "device_instance": 201201,
+        "requests": [{"object_identifier": o, "property_identifier": p} for o, p in pairs],
+    }
+    assert [(r["object_identifier"], r["property_identifier"]) for r in rows] == pairs
+    await bot.close_rpc_dock()
+
+
+@pytest.mark.asyncio
+async def test_rpc_docked_subscriptions_poll_one_rpm_per_device(monkeypatch: pytest.MonkeyPatch) -> None:
+    from easy_aso.snapshot import BAD, GOOD, STALE
+
+    answers = {
+        "201201": [
+            {"object_identifier": "analog-input,2", "property_identifier": "present-value", "value": 68.5},
+            {"object_identifier": "analog-value,1", "property_identifier": "present-value", "value": 72.0},
+            {"object_identifier": "analog-value,1", "property_identifier": "units", "value": "Error: property, unknown-property"},
+        ],
+        "201202": [{"object_identifier": "analog-input,2", "property_identifier": "present-value", "value": 70.5}],
+    }
+
+    async def rpm(address, *args):
+        return answers[address]
+
+    mock_client = MagicMock()
+    mock_client.rpm = AsyncMock(side_effect=rpm)
+    mock_client.close = AsyncMock()
+    monkeypatch.setattr("easy_aso.runtime.rpc_docked.JsonRpcBacnetClient", lambda *a, **k: mock_client)
+    bot = _StubRpcDocked(args=_no_server_args(), rpc_config=BacnetRpcConfig("http://h", "/api"))
+    await bot.create_application()
+
+    bot.subscribe_points(
+        [
+            ("201201", "analog-value,1"),
+            ("201201", "analog-input,2"),
+            ("201201", "analog-value,1", "units"),
+            ("201202", "analog-input,2"),
+        ],
+        interval_s=60,
+    )
+    snap = await bot.refresh_points()
+
+    assert mock_client.rpm.await_count == 2
+    mock_client.rpm.assert_any_await(
+        "201201",
+        "analog-input,2", "present-value",
+        "analog-value,1", "present-value",
+        "analog-value,1", "units",
+    )
+    assert snap[("201201", "analog-value,1")].quality == GOOD
+    assert snap.value(("201202", "analog-input,2")) == 70.5
+    units = snap[("201201", "analog-value,1", "units")]
+    assert units.quality == BAD and "unknown-property" in units.detail
+    assert snap.value(("201201", "analog-value,1", "units"), "n/a") == "n/a"
+
+    # not due yet: no traffic, same values
+    assert (await bot.refresh_points())[("201201", "analog-value,1")].value == 72.0
+    assert mock_client.rpm.await_count == 2
+
+    answers["201201"] = [{"error": "Error during RPM: no-response"}]
+    snap = await bot.refresh_points(force=True)
+    stale = snap[("201201", "analog-value,1")]
+    assert stale.quality == STALE and stale.value == 72.0
+    assert stale.timestamp is not None and stale.timestamp <= snap.taken_at
+    assert snap[("201202", "analog-input,2")].quality == GOOD
+    await bot.close_rpc_dock()
+
+
+@pytest.mark.asyncio
+async def test_rpc_docked_subscriptions_read_two_properties_of_one_object() -> None:
+    import json
+
+    import httpx
+
+    requests: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        req = body["params"]["request"]["requests"]
+        requests.append(req)
+        values = {"present-value": 72.0, "units": "degrees-fahrenheit"}
+        rows = [{**r, "value": values[r["property_identifier"]]} for r in req]
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": {"data": {"results": rows}}})
+
+    bot = _StubRpcDocked(args=_no_server_args(), rpc_config=BacnetRpcConfig("http://h", "/api"))
+    await bot.create_application()
+    bot._rpc._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    bot.subscribe_points([("201201", "analog-value,1"), ("201201", "analog-value,1", "units")], interval_s=60)
+    snap = await bot.refresh_points()
+
+    assert requests == [
+        [
+            {"object_identifier": "analog-value,1", "property_identifier": "present-value"},
+            {"object_identifier": "analog-value,1", "property_identifier": "units"},
+        ]
+    ]
+    assert snap.value(("201201", "analog-value,1")) == 72.0
+    assert snap.value(("201201", "analog-value,1", "units")) == "degrees-fahrenheit"
+    await bot.close_rpc_dock()
+
+
+@pytest.mark.asyncio
+async def test_rpc_docked_write_many_and_release_many(monkeypatch: pytest.MonkeyPatch) -> None:
+    mock_client = MagicMock()
+    mock_client.write_many = AsyncMock(side_effect=lambda writes: [{"status": "success"} for _ in writes])
+    mock_client.close = AsyncMock()
+    monkeypatch.setattr("easy_aso.runtime.rpc_docked.JsonRpcBacnetClient", lambda *a, **k: mock_client)
+    bot = _StubRpcDocked(args=_no_server_args(), rpc_config=BacnetRpcConfig("http://h", "/api"))
+    await bot.create_application()
+
+    out = await bot.write_many([{"address": "201201", "object_identifier": "analog-value,1", "value": 70, "priority": -1}])
+    assert out == [{"status": "success"}]
+    assert mock_client.write_many.await_args.args[0][0]["priority"] is None
+
+    await bot.release_many([("201201", "analog-value,1"), ("201202", "analog-value,1")], 16)
+    released = mock_client.write_many.await_args.args[0]
+    assert [(w["address"], w["value"], w["priority"]) for w in released] == [
+        ("201201", "null", 16),
+        ("201202", "null", 16),
+    ]
+
+    mock_client.write_many = AsyncMock(side_effect=ConnectionError("gateway down"))
+    failed = await bot.release_many([("201201", "analog-value,1")], 16)
+    assert failed[0]["status"] == "error" and failed[0]["detail"] == "gateway down"
+    await bot.close_rpc_dock()
+
+
+@pytest.mark.asyncio
+async def test_rpc_docked_close_releases_recorded_overrides(monkeypatch: pytest.MonkeyPatch) -> None:
+    mock_client = MagicMock()
+    mock_client.write = AsyncMock()
+    mock_client.write_many = AsyncMock(side_effect=lambda writes: [{"status": "success"} for _ in writes])
+    mock_client.close = AsyncMock()
+    monkeypatch.setattr("easy_aso.runtime.rpc_docked.JsonRpcBacnetClient", lambda *a, **k: mock_client)
+    bot = _StubRpcDocked(args=_no_server_args(), rpc_config=BacnetRpcConfig("http://h", "/api"))
+    await bot.create_application()
+
+    await bot.bacnet_write("201201", "analog-value,1", 70.0, 8)
+    await bot.bacnet_write("201201", "analog-value,2", 70.0)  # no priority: nothing to release
+    assert len(bot.overrides) == 1
+
+    await bot.close_rpc_dock()
+    released = mock_client.write_many.await_args.args[0]
+    assert [(w["object_identifier"], w["value"], w["priority"]) for w in released] == [
+        ("analog-value,1", "null", 8)
+    ]
+    assert len(bot.overrides) == 0
+    mock_client.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_jsonrpc_client_write_many_sends_one_call() -> None:
+    import json
+
+    import httpx
+
+    from easy_aso.bacnet_client.jsonrpc_client import JsonRpcBacnetClient
+
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        calls.append(body)
+        rows = [
+            {**w, "service": "write-property-multiple", "status": "success", "detail": None}
+            for w in body["params"]["request"]["writes"]
+        ]
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": {"data": {"results": rows}}})
+
+    client = JsonRpcBacnetClient("http://gw", bearer_token="")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    out = await client.write_many(
+        [
+            {"address": "101", "object_identifier": "analog-value,1", "value": "null", "priority": 8},
+            {"address": "device:102", "object_identifier": "analog-value,1", "value": 21.5, "priority": 8},
+        ]
+    )
+    await client.close()
+
+    assert len(calls) == 1
+    assert calls[0]["method"] == "client_write_many"
+    assert [w["device_instance"] for w in calls[0]["params"]["request"]["writes"]] == [101, 102]
+    assert [r["address"] for r in out] == ["101", "device:102"]
+    assert all(r["status"] == "success" for r in out)
+
+
+@pytest.mark.asyncio
+async def test_jsonrpc_client_subscribe_cov_parses_sse() -> None:
+    import json
+
+    import httpx
+
+    from easy_aso.bacnet_client.jsonrpc_client import JsonRpcBacnetClient
+
+    bodies: list = []
+    stream = (
+        'event: status\ndata: {"type": "status", "device_instance": 101, '
+        '"object_identifier": "analog-input,2", "state": "active", "error": null}\n\n'
+        ": keepalive\n\n"
+        'event: cov\ndata: {"type": "cov", "device_instance": 101, '
+        '"object_identifier": "analog-input,2", "property_identifier": "present-value", '
+        '"value": 21.5, "timestamp": 1.0}\n\n'
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, text=stream, headers={"content-type": "text/event-stream"})
+
+    client = JsonRpcBacnetClient("http://gw", bearer_token="")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    events = [e async for e in client.subscribe_cov([("device:101", "analog-input,2")])]
+    await client.close()
+
+    assert bodies == [
+        ("/stream/cov", {"targets": [{"device_instance": 101, "object_identifier": "analog-input,2"}]})
+    ]
+    assert [e["type"] for e in events] == ["status", "cov"]
+    assert events[1]["address"] == "101"
+    assert events[1]["value"] == 21.5
+
+
+@pytest.mark.asyncio
+async def test_clients_accept_unix_socket_urls(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import json
+
+    import uvicorn
+
+    from easy_aso.bacnet_client.jsonrpc_client import JsonRpcBacnetClient
+    from easy_aso.bacnet_client.remote_client import RemoteBacnetClient
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        body = json.loads((await receive())["body"])
+        if scope["path"] == "/api":
+            payload = {"jsonrpc": "2.0", "id": body["id"], "result": {"present-value": 21.5}}
+        else:
+            payload = {"value": 22.5}
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": json.dumps(payload).encode()})
+
+    uds = str(tmp_path / "rpc.sock")
+    server = uvicorn.Server(uvicorn.Config(app, uds=uds, log_level="warning"))
+    serving = asyncio.ensure_future(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    try:
+        monkeypatch.setenv("SUPERVISOR_BACNET_RPC_URL", f"unix://{uds}")
+        cfg = load_rpc_config_from_env()
+        assert cfg.base_url == f"unix://{uds}"
+        rpc = JsonRpcBacnetClient(cfg.base_url, bearer_token="")
+        assert await rpc.read("101", "analog-value,1") == 21.5
+        await rpc.close()
+
+        remote = RemoteBacnetClient(f"unix://{uds}")
+        assert await remote.read("10.0.0.5", "analog-value,1") == 22.5
+        await remote.close()
+    finally:
+        server.should_exit = True
+        await serving
+
+
+@pytest.mark.asyncio
+async def test_websocket_client_multiplexes_and_reconnects(tmp_path) -> None:
+    import msgpack
+    import uvicorn
+
+    from easy_aso.bacnet_client.jsonrpc_client import make_jsonrpc_client
+    from easy_aso.bacnet_client.ws_client import WebSocketBacnetClient
+
+    connections: list = []
+
+    async def app(scope, receive, send):
+        if scope["type"] != "websocket":
+            return
+        await receive()  # websocket.connect
+        assert "bacnet-rpc.msgpack" in scope["subprotocols"]
+        await send({"type": "websocket.accept", "subprotocol": "bacnet-rpc.msgpack"})
+        connections.append(scope)
+
+        async def answer(call):
+            req = call["params"]["request"]
+            if req["device_instance"] == 666:
+                await send({"type": "websocket.close"})
+                return
+            if req["device_instance"] == 404:
+                reply = {"id": call["id"], "error": {"code": 1001, "message": "BACnet device not found"}}
+            else:
+                # the first device answers last
+                await asyncio.sleep(0.05 if req["device_instance"] == 1 else 0)
+                reply = {"id": call["id"], "result": {"present-value": float(req["device_instance"])}}
+            await send({"type": "websocket.send", "bytes": msgpack.packb(reply)})
+
+        tasks = []
+        while True:
+            message = await receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            tasks.append(asyncio.ensure_future(answer(msgpack.unpackb(message["bytes"]))))
+        for task in tasks:
+            task.cancel()
+
+    uds = str(tmp_path / "rpc.sock")
+    server = uvicorn.Server(uvicorn.Config(app, uds=uds, log_level="warning"))
+    serving = asyncio.ensure_future(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    try:
+        client = make_jsonrpc_client(f"unix://{uds}", "ws", bearer_token="")
+        assert isinstance(client, WebSocketBacnetClient)
+        assert client.encoding == "msgpack"
+
+        values = await asyncio.gather(*(client.read(str(i), "analog-input,1") for i in (1, 2, 3)))
+        assert values == [1.0, 2.0, 3.0]
+        assert len(connections) == 1
+
+        with pytest.raises(RuntimeError, match="BACnet device not found"):
+            await client.read("404", "analog-input,1")
+
+        # the server drops the channel: calls in flight fail, the next call reconnects
+        with pytest.raises(ConnectionResetError):
+            await client.read("666", "analog-input,1")
+        assert await client.read("7", "analog-input,1") == 7.0
+        assert len(connections) == 2
+        await client.close()
+    finally:
+        server.should_exit = True
+        await serving
+
+
 @pytest.mark.asyncio
 async def test_quick_agent_lifecycle(monkeypatch: pytest.MonkeyPatch) -> None:
     """One on_step then stop (no full ``EasyASO.run()`` signal wiring)."""
@@ -139,6 +515,32 @@ async def test_quick_agent_lifecycle(monkeypatch: pytest.MonkeyPatch) -> None:
     await bot.close_rpc_dock()
 
 
+@pytest.mark.asyncio
+async def test_rpc_docked_stop_signal_releases_once(monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    class Overrider(_StubRpcDocked):
+        async def on_step(self) -> None:
+            await self.bacnet_write("201201", "analog-value,1", 70, 8)
+            await asyncio.sleep(0.01)
+
+    mock_client = MagicMock(write=AsyncMock(), close=AsyncMock())
+    # the device is gone: the override stays for the next start
+    mock_client.write_many = AsyncMock(side_effect=lambda writes: [{"status": "error"} for _ in writes])
+    monkeypatch.setattr("easy_aso.runtime.rpc_docked.JsonRpcBacnetClient", lambda *a, **k: mock_client)
+    bot = Overrider(args=_no_server_args(), rpc_config=BacnetRpcConfig("http://h", "/api"))
+    await bot.create_application()
+
+    lifecycle = asyncio.ensure_future(bot.run_lifecycle())
+    await asyncio.sleep(0.05)
+    await bot.stop_handler()
+    await asyncio.gather(lifecycle, return_exceptions=True)
+
+    assert mock_client.write_many.await_count == 1
+    assert mock_client.close.await_count == 1
+    assert len(bot.overrides) == 1
+    out = capsys.readouterr().out
+    assert out.count("Override not released") == 1
+    assert "write_many failed" not in out
+
 def test_cli_run_invokes_runner(monkeypatch: pytest.MonkeyPatch) -> None:
     called: dict = {}
 
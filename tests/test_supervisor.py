@@ -118,3 +118,65 @@ def test_supervisor_http_crud(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -
         assert hh.status_code == 200
         client.delete(f"/api/v1/points/{r4.json()['id']}")
         client.delete(f"/api/v1/devices/{did}")
+
+
+@pytest.mark.asyncio
+async def test_trend_ingest_pulls_only_new_records(tmp_path: Path) -> None:
+    from easy_aso.supervisor.drivers.stub import StubDriver
+    from easy_aso.supervisor.runtime.poller import run_one_poll
+    from easy_aso.supervisor.runtime.trends import run_trend_ingest
+
+    conn = await open_supervisor_db(str(tmp_path / "t5.sqlite"))
+    repo = SupervisorRepository(conn)
+    dev = await repo.create_device(name="AHU", driver_type="stub", device_address="0")
+    trend = await repo.create_point(dev.id, object_identifier="trend-log,1", property_identifier="log-buffer")
+    live = await repo.create_point(dev.id, object_identifier="analog-input,1")
+    driver = StubDriver()
+    try:
+        errors = await run_trend_ingest(repo, dev, driver, max_records=4)
+        assert errors == {}
+        records = await repo.list_trend_records(trend.id)
+        assert [r.sequence for r in records] == list(range(1, 11))
+        assert records[-1].decoded_value() == 10.0
+        assert await repo.get_trend_cursor(trend.id) == 10
+
+        # nothing new on the next ingest; RPM polling skips the trend point
+        assert await run_trend_ingest(repo, dev, driver, max_records=4) == {}
+        assert len(await repo.list_trend_records(trend.id)) == 10
+        _, polled = await run_one_poll(repo, dev, driver)
+        assert [p.id for p in polled] == [live.id]
+    finally:
+        await conn.close()
+
+
+@pytest.mark.asyncio
+async def test_jsonrpc_driver_resyncs_after_log_reset() -> None:
+    from easy_aso.supervisor.drivers.bacnet_jsonrpc import BacnetJsonRpcDriver
+    from easy_aso.supervisor.store.models import Device, Point
+
+    calls: list = []
+
+    class FakeClient:
+        async def read_range(self, address, obj, *, range_type, reference, count, property_identifier):
+            calls.append((range_type, reference))
+            if range_type == "sequence":
+                return {"records": [], "more": False}
+            return {"records": [{"sequence": 1, "timestamp": "2024-01-01T00:00:00.00", "value": 1.0}], "more": False}
+
+        async def read(self, address, obj, prop):
+            assert prop == "total-record-count"
+            return 3  # log was cleared: fewer records than our cursor
+
+        async def close(self):
+            pass
+
+    device = Device("d", "AHU", "bacnet_jsonrpc", "1234", None, None, 5.0, True, "", "")
+    point = Point("p", "d", "", "trend-log,1", "log-buffer", True, None, None, None, "", "")
+    driver = BacnetJsonRpcDriver(device)
+    await driver.close()
+    driver._client = FakeClient()
+
+    result = await driver.read_trend(device, point, 500, 100)
+    assert result.resynced
+    assert [r["sequence"] for r in result.records] == [1]
+    assert calls == [("sequence", 501), ("position", 1)]